@@ -3,7 +3,7 @@ Admin configuration for access app.
 Конфигурация админ-панели для приложения access.
 """
 from django.contrib import admin
-from .models import Role, Resource, Action, Permission, UserRole
+from .models import Role, Resource, Action, Permission, UserRole, ObjectPermission
 
 
 @admin.register(Role)
@@ -12,7 +12,8 @@ class RoleAdmin(admin.ModelAdmin):
     Admin interface for Role model.
     Интерфейс админ-панели для модели Role.
     """
-    list_display = ('name', 'description', 'created_at')
+    list_display = ('name', 'parent', 'description', 'created_at')
+    list_filter = ('parent',)
     search_fields = ('name', 'description')
 
 
@@ -32,7 +33,7 @@ class ActionAdmin(admin.ModelAdmin):
     Admin interface for Action model.
     Интерфейс админ-панели для модели Action.
     """
-    list_display = ('name', 'description', 'created_at')
+    list_display = ('name', 'bit', 'description', 'created_at')
     search_fields = ('name', 'description')
 
 
@@ -56,3 +57,14 @@ class UserRoleAdmin(admin.ModelAdmin):
     list_display = ('user', 'role', 'assigned_at')
     list_filter = ('role', 'assigned_at')
     search_fields = ('user__email', 'user__full_name', 'role__name')
+
+
+@admin.register(ObjectPermission)
+class ObjectPermissionAdmin(admin.ModelAdmin):
+    """
+    Admin interface for ObjectPermission model.
+    Интерфейс админ-панели для модели ObjectPermission.
+    """
+    list_display = ('user', 'resource', 'action', 'object_id', 'created_at')
+    list_filter = ('resource', 'action')
+    search_fields = ('user__email', 'resource__name')
@@ -0,0 +1,17 @@
+"""
+App configuration for access app.
+Конфигурация приложения access.
+"""
+from django.apps import AppConfig
+
+
+class AccessConfig(AppConfig):
+    """
+    Access app config, connects cache invalidation signals and system checks.
+    Конфигурация приложения access, подключает сигналы инвалидации кэша и системные проверки.
+    """
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'access'
+    
+    def ready(self):
+        from . import checks, signals  # noqa: F401
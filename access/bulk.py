@@ -0,0 +1,145 @@
+"""
+Bulk create/delete of role assignments and permission rules.
+Массовое создание/удаление назначений ролей и правил доступа.
+
+Referenced ids are checked with one in_bulk() per model, rows are written with
+bulk_create(ignore_conflicts=True) and set-based deletes, and every item gets
+its own result. Per-row signals are suspended; masks are refreshed and cache
+generations bumped once for the whole batch.
+Id из запроса проверяются одним in_bulk() на модель, строки записываются через
+bulk_create(ignore_conflicts=True) и удаление множествами, и каждый элемент
+получает свой результат. Построчные сигналы отключены; маски обновляются и
+поколения кэша увеличиваются один раз на весь пакет.
+"""
+from functools import partial
+from django.conf import settings
+from django.db import transaction
+from users.models import User
+from .cache import bump_users_generation, bump_roles_generation
+from .masks import refresh_masks
+from .models import Role, Resource, Action, Permission, UserRole
+from .signals import invalidation_suspended
+
+CREATED = 'created'
+EXISTS = 'exists'
+DELETED = 'deleted'
+NOT_FOUND = 'not_found'
+
+USER_ROLE_REFERENCES = {'user_id': User, 'role_id': Role}
+PERMISSION_REFERENCES = {'role_id': Role, 'resource_id': Resource, 'action_id': Action}
+
+
+def get_bulk_max_items():
+    """
+    Maximum number of items in one bulk request.
+    Максимальное число элементов в одном массовом запросе.
+    """
+    return getattr(settings, 'ACCESS_BULK_MAX_ITEMS', 5000)
+
+
+def _existing(model, fields, keys):
+    """
+    Map existing rows among keys (tuples of field values) to their pk.
+    Соответствие существующих строк среди ключей (кортежей значений полей) их pk.
+    """
+    if not keys:
+        return {}
+    filters = {f'{field}__in': {key[i] for key in keys} for i, field in enumerate(fields)}
+    rows = model.objects.filter(**filters).values_list(*fields, 'pk')
+    return {row[:-1]: row[-1] for row in rows if row[:-1] in keys}
+
+
+def _bulk_create(model, references, items):
+    """
+    Create link rows, returns (per-item results, created keys).
+    Создание строк-связей, возвращает (результаты по элементам, созданные ключи).
+    """
+    fields = tuple(references)
+    found = {
+        field: related.objects.only('pk').in_bulk({item[field] for item in items})
+        for field, related in references.items()
+    }
+    results, keys = [], set()
+    for item in items:
+        result = dict(item)
+        missing = [field for field in fields if item[field] not in found[field]]
+        if missing:
+            result.update(status=NOT_FOUND, missing=missing)
+        else:
+            keys.add(tuple(item[field] for field in fields))
+        results.append(result)
+    
+    new = keys - set(_existing(model, fields, keys))
+    model.objects.bulk_create(
+        [model(**dict(zip(fields, key))) for key in new], batch_size=1000, ignore_conflicts=True
+    )
+    pending = set(new)
+    for result in results:
+        if 'status' in result:
+            continue
+        key = tuple(result[field] for field in fields)
+        result['status'] = CREATED if key in pending else EXISTS
+        pending.discard(key)
+    return results, new
+
+
+def _bulk_delete(model, fields, items):
+    """
+    Delete link rows, returns (per-item results, deleted keys).
+    Удаление строк-связей, возвращает (результаты по элементам, удаленные ключи).
+    """
+    keys = {tuple(item[field] for field in fields) for item in items}
+    existing = _existing(model, fields, keys)
+    model.objects.filter(pk__in=list(existing.values())).delete()
+    results, pending = [], set(existing)
+    for item in items:
+        key = tuple(item[field] for field in fields)
+        results.append({**item, 'status': DELETED if key in pending else NOT_FOUND})
+        pending.discard(key)
+    return results, set(existing)
+
+
+def bulk_create_user_roles(items):
+    """
+    Assign roles to users, items are dicts with user_id and role_id.
+    Назначение ролей пользователям, элементы — словари с user_id и role_id.
+    """
+    with transaction.atomic(), invalidation_suspended():
+        results, created = _bulk_create(UserRole, USER_ROLE_REFERENCES, items)
+        transaction.on_commit(partial(bump_users_generation, [user_id for user_id, _ in created]))
+    return results
+
+
+def bulk_delete_user_roles(items):
+    """
+    Remove role assignments, items are dicts with user_id and role_id.
+    Снятие назначений ролей, элементы — словари с user_id и role_id.
+    """
+    with transaction.atomic(), invalidation_suspended():
+        results, deleted = _bulk_delete(UserRole, tuple(USER_ROLE_REFERENCES), items)
+        transaction.on_commit(partial(bump_users_generation, [user_id for user_id, _ in deleted]))
+    return results
+
+
+def bulk_create_permissions(items):
+    """
+    Create rules, items are dicts with role_id, resource_id and action_id.
+    Создание правил, элементы — словари с role_id, resource_id и action_id.
+    """
+    with transaction.atomic(), invalidation_suspended():
+        results, created = _bulk_create(Permission, PERMISSION_REFERENCES, items)
+        refresh_masks({(role_id, resource_id) for role_id, resource_id, _ in created})
+        transaction.on_commit(partial(bump_roles_generation, {role_id for role_id, _, _ in created}))
+    return results
+
+
+def bulk_delete_permissions(items):
+    """
+    Delete rules, items are dicts with role_id, resource_id and action_id.
+    Удаление правил, элементы — словари с role_id, resource_id и action_id.
+    """
+    with transaction.atomic(), invalidation_suspended():
+        results, deleted = _bulk_delete(Permission, tuple(PERMISSION_REFERENCES), items)
+        refresh_masks({(role_id, resource_id) for role_id, resource_id, _ in deleted})
+        transaction.on_commit(partial(bump_roles_generation, {role_id for role_id, _, _ in deleted}))
+    return results
@@ -0,0 +1,279 @@
+"""
+Compiled per-user permission cache.
+Кэш скомпилированных прав доступа пользователя.
+"""
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import caches
+from .masks import expand_masks
+from .matching import PermissionSet
+from .models import RoleClosure, RolePermissionMask, UserRole
+from .registry import get_names, aget_names
+
+PERMISSIONS_KEY = 'access:perms:{user_id}:{epoch}:{generation}'
+USER_GENERATION_KEY = 'access:gen:user:{user_id}'
+GLOBAL_EPOCH_KEY = 'access:gen:epoch'
+
+
+def get_cache():
+    """
+    Return the cache backend used for access control data.
+    Возвращает бэкенд кэша, используемый для данных контроля доступа.
+    """
+    return caches[getattr(settings, 'ACCESS_CACHE_ALIAS', 'default')]
+
+
+def get_timeout():
+    """
+    Return TTL of compiled permission sets in seconds.
+    Возвращает время жизни скомпилированных наборов прав в секундах.
+    """
+    return getattr(settings, 'ACCESS_PERMISSION_CACHE_TIMEOUT', 300)
+
+
+def _initial_generation():
+    """
+    Initial counter value. Counters start from a time-based value, so a counter
+    evicted from the cache never comes back with a version that is still cached.
+    Начальное значение счетчика. Счетчики начинаются со значения, зависящего
+    от времени, поэтому вытесненный из кэша счетчик не вернется с версией,
+    которая все еще закэширована.
+    """
+    return int(time.time() * 1000)
+
+
+def _ensure_counter(key):
+    """
+    Get counter value, initializing it if missing.
+    Получение значения счетчика с инициализацией при отсутствии.
+    """
+    cache = get_cache()
+    cache.add(key, _initial_generation(), timeout=None)
+    value = cache.get(key)
+    return value if value is not None else _initial_generation()
+
+
+def _bump_counter(key):
+    """
+    Increment counter, (re)initializing it if missing.
+    Увеличение счетчика с (пере)инициализацией при отсутствии.
+    """
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _initial_generation(), timeout=None)
+
+
+def get_permission_version(user_id):
+    """
+    Return (global epoch, user generation) pair the user's cache key is built from.
+    Возвращает пару (глобальная эпоха, поколение пользователя), из которой
+    строится ключ кэша пользователя.
+    """
+    user_key = USER_GENERATION_KEY.format(user_id=user_id)
+    values = get_cache().get_many([GLOBAL_EPOCH_KEY, user_key])
+    epoch = values.get(GLOBAL_EPOCH_KEY)
+    generation = values.get(user_key)
+    if epoch is None:
+        epoch = _ensure_counter(GLOBAL_EPOCH_KEY)
+    if generation is None:
+        generation = _ensure_counter(user_key)
+    return epoch, generation
+
+
+def get_global_epoch():
+    """
+    Return the global epoch alone.
+    Возвращает только глобальную эпоху.
+    """
+    epoch = get_cache().get(GLOBAL_EPOCH_KEY)
+    return epoch if epoch is not None else _ensure_counter(GLOBAL_EPOCH_KEY)
+
+
+def get_permission_etag(user_id):
+    """
+    Strong ETag of the user's compiled permission set, derived from its version.
+    Строгий ETag скомпилированного набора прав пользователя на основе его версии.
+    """
+    epoch, generation = get_permission_version(user_id)
+    digest = hashlib.sha256(f'{user_id}:{epoch}:{generation}'.encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def bump_user_generation(user_id):
+    """
+    Invalidate compiled permissions of a single user.
+    Инвалидация скомпилированных прав одного пользователя.
+    """
+    _bump_counter(USER_GENERATION_KEY.format(user_id=user_id))
+
+
+def bump_global_epoch():
+    """
+    Invalidate compiled permissions of all users.
+    Инвалидация скомпилированных прав всех пользователей.
+    """
+    _bump_counter(GLOBAL_EPOCH_KEY)
+
+
+def bump_users_generation(user_ids):
+    """
+    Invalidate compiled permissions of several users.
+    Инвалидация скомпилированных прав нескольких пользователей.
+    """
+    for user_id in set(user_ids):
+        bump_user_generation(user_id)
+
+
+def bump_role_generation(role_id):
+    """
+    Invalidate compiled permissions of every user holding the role
+    or a role inheriting from it.
+    Инвалидация скомпилированных прав всех пользователей с данной ролью
+    или ролью, которая от нее наследует.
+    """
+    bump_roles_generation([role_id])
+
+
+def role_users_queryset(role_ids):
+    """
+    Ids of users holding one of the roles or a role inheriting from them.
+    Id пользователей с одной из ролей или ролью, которая от них наследует.
+    """
+    return UserRole.objects.filter(
+        role_id__in=RoleClosure.objects.filter(ancestor_id__in=role_ids).values('descendant_id')
+    ).order_by().values_list('user_id', flat=True)
+
+
+def bump_roles_generation(role_ids):
+    """
+    Invalidate compiled permissions of every user holding one of the roles
+    or a role inheriting from them, with one query.
+    Инвалидация скомпилированных прав всех пользователей с одной из ролей
+    или ролью, которая от них наследует, одним запросом.
+    """
+    if not role_ids:
+        return
+    bump_users_generation(
+        role_users_queryset(role_ids)
+    )
+
+
+def user_role_closure_queryset(user_id):
+    """
+    Ids of the user's roles and all their ancestors, as a subquery that reads
+    only the (user_id, role_id) and (descendant_id, ancestor_id) indexes.
+    Id ролей пользователя и всех их предков — подзапрос, читающий только
+    индексы (user_id, role_id) и (descendant_id, ancestor_id).
+    """
+    return RoleClosure.objects.filter(
+        descendant_id__in=UserRole.objects.filter(user_id=user_id).values('role_id')
+    ).values('ancestor_id')
+
+
+def user_permission_masks_queryset(user_id):
+    """
+    Queryset of (resource_id, actions mask) rows granted to the user,
+    directly or inherited through the role hierarchy closure.
+    Queryset строк (id ресурса, маска действий), доступных пользователю
+    напрямую или по наследованию через замыкание иерархии ролей.
+    """
+    return (
+        RolePermissionMask.objects.filter(role_id__in=user_role_closure_queryset(user_id))
+        .order_by()
+        .values_list('resource_id', 'actions')
+    )
+
+
+def compile_user_permissions(user_id, epoch):
+    """
+    Build the set of (resource_name, action_name) pairs granted to the user
+    from permission masks, with wildcard pairs compiled into a matcher.
+    Names come from the interned names of the epoch.
+    Построение множества пар (имя ресурса, имя действия), доступных пользователю,
+    по маскам прав, с компиляцией пар с подстановкой в матчер.
+    Имена берутся из интернированных имен эпохи.
+    """
+    return PermissionSet(expand_masks(user_permission_masks_queryset(user_id), get_names(epoch)))
+
+
+def get_user_permissions(user):
+    """
+    Return the compiled permission set of the user, using the cache.
+    Возвращает скомпилированный набор прав пользователя с использованием кэша.
+    
+    Args:
+        user: User instance / Экземпляр пользователя
+    
+    Returns:
+        PermissionSet: Set of (resource_name, action_name) pairs, wildcards included
+        Множество пар (имя ресурса, имя действия), включая шаблоны
+    """
+    if not user or not user.is_authenticated:
+        return frozenset()
+    
+    epoch, generation = get_permission_version(user.pk)
+    key = PERMISSIONS_KEY.format(user_id=user.pk, epoch=epoch, generation=generation)
+    cache = get_cache()
+    permissions = cache.get(key)
+    if permissions is None:
+        permissions = compile_user_permissions(user.pk, epoch)
+        cache.set(key, permissions, get_timeout())
+    return permissions
+
+
+async def _aensure_counter(key):
+    """
+    Async variant of _ensure_counter.
+    Асинхронный вариант _ensure_counter.
+    """
+    cache = get_cache()
+    await cache.aadd(key, _initial_generation(), timeout=None)
+    value = await cache.aget(key)
+    return value if value is not None else _initial_generation()
+
+
+async def aget_permission_version(user_id):
+    """
+    Async variant of get_permission_version.
+    Асинхронный вариант get_permission_version.
+    """
+    user_key = USER_GENERATION_KEY.format(user_id=user_id)
+    values = await get_cache().aget_many([GLOBAL_EPOCH_KEY, user_key])
+    epoch = values.get(GLOBAL_EPOCH_KEY)
+    generation = values.get(user_key)
+    if epoch is None:
+        epoch = await _aensure_counter(GLOBAL_EPOCH_KEY)
+    if generation is None:
+        generation = await _aensure_counter(user_key)
+    return epoch, generation
+
+
+async def aget_global_epoch():
+    """
+    Async variant of get_global_epoch.
+    Асинхронный вариант get_global_epoch.
+    """
+    epoch = await get_cache().aget(GLOBAL_EPOCH_KEY)
+    return epoch if epoch is not None else await _aensure_counter(GLOBAL_EPOCH_KEY)
+
+
+async def aget_user_permissions(user):
+    """
+    Async variant of get_user_permissions, uses async cache and ORM APIs.
+    Асинхронный вариант get_user_permissions, использует async API кэша и ORM.
+    """
+    if not user or not user.is_authenticated:
+        return frozenset()
+    
+    epoch, generation = await aget_permission_version(user.pk)
+    key = PERMISSIONS_KEY.format(user_id=user.pk, epoch=epoch, generation=generation)
+    cache = get_cache()
+    permissions = await cache.aget(key)
+    if permissions is None:
+        rows = [row async for row in user_permission_masks_queryset(user.pk)]
+        permissions = PermissionSet(expand_masks(rows, await aget_names(epoch)))
+        await cache.aset(key, permissions, get_timeout())
+    return permissions
@@ -0,0 +1,35 @@
+"""
+System checks for access app.
+Системные проверки приложения access.
+"""
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from .cache import get_cache
+
+# Backends whose data is not shared between processes / Бэкенды, данные которых не общие для процессов
+PER_PROCESS_CACHES = (LocMemCache, DummyCache)
+
+
+@register(Tags.caches)
+def check_access_cache(app_configs, **kwargs):
+    """
+    Warn when the access cache is per-process outside DEBUG: generation
+    counters, the epoch and the names registry would not be shared, so
+    invalidation in one worker would never reach the others.
+    Предупреждение, если кэш доступа локален для процесса вне DEBUG: счетчики
+    поколений, эпоха и реестр имен не были бы общими, и инвалидация в одном
+    процессе не доходила бы до других.
+    """
+    if settings.DEBUG or not isinstance(get_cache(), PER_PROCESS_CACHES):
+        return []
+    alias = getattr(settings, 'ACCESS_CACHE_ALIAS', 'default')
+    return [Warning(
+        f'ACCESS_CACHE_ALIAS "{alias}" uses a per-process cache backend; permission invalidation '
+        f'does not reach other workers. / ACCESS_CACHE_ALIAS "{alias}" использует кэш в памяти '
+        f'процесса; инвалидация прав не доходит до других процессов.',
+        hint='Set CACHE_URL to a shared cache, e.g. redis://localhost:6379/1. / '
+             'Задайте CACHE_URL общего кэша, например redis://localhost:6379/1.',
+        id='access.W001',
+    )]
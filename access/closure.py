@@ -0,0 +1,86 @@
+"""
+Incremental maintenance of the role hierarchy closure table.
+Инкрементальное обслуживание таблицы замыкания иерархии ролей.
+
+Moving a role detaches its whole subtree from the old ancestors and attaches
+it to the ancestors of the new parent, so only rows of that subtree change.
+При перемещении роли все ее поддерево отсоединяется от старых предков и
+присоединяется к предкам нового родителя, поэтому меняются только строки поддерева.
+"""
+from django.db import transaction
+from .models import Role, RoleClosure
+
+
+def subtree_role_ids(role_id):
+    """
+    Ids of the role and all roles inheriting from it.
+    Id роли и всех ролей, которые от нее наследуют.
+    """
+    return list(RoleClosure.objects.filter(ancestor_id=role_id).values_list('descendant_id', flat=True))
+
+
+def add_role(role_id, parent_id=None):
+    """
+    Add rows of a new role: to itself and to every ancestor of its parent.
+    Добавление строк новой роли: на саму себя и на всех предков ее родителя.
+    """
+    ancestors = []
+    if parent_id is not None:
+        ancestors = RoleClosure.objects.filter(descendant_id=parent_id).values_list('ancestor_id', 'depth')
+    RoleClosure.objects.bulk_create([RoleClosure(ancestor_id=role_id, descendant_id=role_id, depth=0)] + [
+        RoleClosure(ancestor_id=ancestor_id, descendant_id=role_id, depth=depth + 1)
+        for ancestor_id, depth in ancestors
+    ])
+
+
+def move_role(role_id, parent_id):
+    """
+    Re-attach the role with its subtree under parent_id (None detaches it).
+    Перенос роли вместе с поддеревом под parent_id (None отсоединяет ее).
+    """
+    subtree = dict(RoleClosure.objects.filter(ancestor_id=role_id).values_list('descendant_id', 'depth'))
+    if parent_id in subtree:
+        raise ValueError('Role cannot inherit from itself or its descendant / '
+                         'Роль не может наследовать от себя или своего потомка')
+    
+    with transaction.atomic():
+        RoleClosure.objects.filter(descendant_id__in=subtree).exclude(ancestor_id__in=subtree).delete()
+        if parent_id is None:
+            return
+        ancestors = RoleClosure.objects.filter(descendant_id=parent_id).values_list('ancestor_id', 'depth')
+        RoleClosure.objects.bulk_create([
+            RoleClosure(ancestor_id=ancestor_id, descendant_id=descendant_id, depth=ancestor_depth + 1 + depth)
+            for ancestor_id, ancestor_depth in ancestors
+            for descendant_id, depth in subtree.items()
+        ])
+
+
+def detach_role(role_id):
+    """
+    Detach subtree of a role that is being deleted from the role's ancestors.
+    Children lose the parent (SET_NULL) without save signals, so this is done here.
+    Отсоединение поддерева удаляемой роли от ее предков. Дочерние роли теряют
+    родителя (SET_NULL) без сигналов сохранения, поэтому это делается здесь.
+    """
+    subtree = subtree_role_ids(role_id)
+    RoleClosure.objects.filter(descendant_id__in=subtree).exclude(ancestor_id__in=subtree).delete()
+
+
+def rebuild_closure():
+    """
+    Rebuild the whole closure table from Role.parent, returns number of rows.
+    Полное перестроение таблицы замыкания по Role.parent, возвращает число строк.
+    """
+    parents = dict(Role.objects.values_list('id', 'parent_id'))
+    rows = []
+    for role_id in parents:
+        ancestor_id, depth, seen = role_id, 0, set()
+        while ancestor_id is not None and ancestor_id not in seen:
+            seen.add(ancestor_id)
+            rows.append(RoleClosure(ancestor_id=ancestor_id, descendant_id=role_id, depth=depth))
+            ancestor_id, depth = parents.get(ancestor_id), depth + 1
+    
+    with transaction.atomic():
+        RoleClosure.objects.all().delete()
+        RoleClosure.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
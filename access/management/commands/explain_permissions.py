@@ -0,0 +1,91 @@
+"""
+Show query plans of the permission check path.
+Вывод планов запросов пути проверки прав.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from access.cache import user_permission_masks_queryset, role_users_queryset
+from access.models import UserRole
+
+# Plan markers per backend: (index-only access, index + table access, full scan)
+# Маркеры плана по бэкендам: (только индекс, индекс + таблица, полное сканирование)
+PLAN_MARKERS = {
+    'postgresql': (('Index Only Scan',), ('Index Scan', 'Bitmap Index Scan'), ('Seq Scan',)),
+    'sqlite': (('COVERING INDEX', 'INTEGER PRIMARY KEY'), ('USING INDEX',), ('SCAN ',)),
+}
+
+
+def classify(line, vendor):
+    """
+    Classify a plan line as index_only, index, full_scan or None.
+    Классификация строки плана: index_only, index, full_scan или None.
+    """
+    index_only, index, full_scan = PLAN_MARKERS[vendor]
+    if any(marker in line for marker in index_only):
+        return 'index_only'
+    if any(marker in line for marker in index):
+        return 'index'
+    if any(marker in line for marker in full_scan):
+        return 'full_scan'
+    return None
+
+
+class Command(BaseCommand):
+    """
+    Run EXPLAIN for the permission compilation and invalidation queries and
+    report whether they use index-only access.
+    Запуск EXPLAIN для запросов компиляции и инвалидации прав и отчет,
+    используется ли доступ только по индексу.
+    """
+    help = 'EXPLAIN permission check queries / EXPLAIN запросов проверки прав'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--user-id', type=int, help='User to explain for (default: any user with roles)')
+        parser.add_argument('--analyze', action='store_true',
+                            help='EXPLAIN ANALYZE on PostgreSQL (runs the queries) / EXPLAIN ANALYZE на PostgreSQL')
+    
+    def handle(self, *args, **options):
+        user_id = options['user_id']
+        if user_id is None:
+            user_id = UserRole.objects.order_by().values_list('user_id', flat=True).first()
+            if user_id is None:
+                raise CommandError('No role assignments to explain / Нет назначений ролей для анализа')
+        role_ids = list(UserRole.objects.filter(user_id=user_id).order_by().values_list('role_id', flat=True))
+        
+        explain_options = {}
+        if options['analyze'] and connection.vendor == 'postgresql':
+            explain_options = {'analyze': True, 'buffers': True}
+        
+        queries = {
+            'compile (user -> masks)': user_permission_masks_queryset(user_id),
+            'invalidate (roles -> users)': role_users_queryset(role_ids or [0]),
+        }
+        totals = {'index_only': 0, 'index': 0, 'full_scan': 0}
+        for name, queryset in queries.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{name} [{connection.vendor}]'))
+            for line in queryset.explain(**explain_options).splitlines():
+                kind = classify(line, connection.vendor) if connection.vendor in PLAN_MARKERS else None
+                if kind:
+                    totals[kind] += 1
+                style = {'index_only': self.style.SUCCESS, 'full_scan': self.style.WARNING}.get(kind, str)
+                self.stdout.write(style(f'  {line}'))
+        
+        if connection.vendor not in PLAN_MARKERS:
+            self.stdout.write(self.style.WARNING(
+                f'Plans of {connection.vendor} are not classified / Планы {connection.vendor} не классифицируются'
+            ))
+            return
+        self.stdout.write(
+            f'index-only: {totals["index_only"]}, index + table: {totals["index"]}, full scans: {totals["full_scan"]} / '
+            f'только индекс: {totals["index_only"]}, индекс + таблица: {totals["index"]}, '
+            f'полные сканирования: {totals["full_scan"]}'
+        )
+        if totals['index'] or totals['full_scan']:
+            self.stdout.write(self.style.WARNING(
+                'Not every step is index-only. Planners scan small tables fully, check with realistic data '
+                '(e.g. after bench) and fresh statistics (ANALYZE). / '
+                'Не все шаги только по индексу. Планировщики полностью сканируют маленькие таблицы, проверьте '
+                'на реалистичных данных (например, после bench) и свежей статистике (ANALYZE).'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS('All steps use index-only access / Все шаги используют только индекс'))
@@ -0,0 +1,29 @@
+"""
+Export the access control policy document.
+Экспорт документа политики контроля доступа.
+"""
+from django.core.management.base import BaseCommand
+from access.policy import export_policy
+
+
+class Command(BaseCommand):
+    """
+    Write the policy as one JSON document, streaming rows from the database.
+    Запись политики одним JSON-документом с потоковым чтением строк из БД.
+    """
+    help = 'Export access control policy / Экспорт политики контроля доступа'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--output', '-o', help='Output file (default: stdout) / Файл вывода (по умолчанию stdout)')
+    
+    def handle(self, *args, **options):
+        if not options['output']:
+            for chunk in export_policy():
+                self.stdout.write(chunk, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8') as f:
+            for chunk in export_policy():
+                f.write(chunk)
+        self.stderr.write(self.style.SUCCESS(
+            f'Policy written to {options["output"]} / Политика записана в {options["output"]}'
+        ))
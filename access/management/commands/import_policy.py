@@ -0,0 +1,45 @@
+"""
+Apply an access control policy document.
+Применение документа политики контроля доступа.
+"""
+import json
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from access.policy import PolicyError, apply_policy
+
+
+class Command(BaseCommand):
+    """
+    Apply a policy JSON document as a diff in one transaction.
+    Применение JSON-документа политики как разницы в одной транзакции.
+    """
+    help = 'Import access control policy / Импорт политики контроля доступа'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Policy JSON file, "-" for stdin / JSON-файл политики, "-" для stdin')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report changes / Только показать изменения')
+    
+    def handle(self, *args, **options):
+        try:
+            if options['path'] == '-':
+                document = json.load(sys.stdin)
+            else:
+                with open(options['path'], encoding='utf-8') as f:
+                    document = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Cannot read policy: {e} / Не удалось прочитать политику: {e}')
+        
+        try:
+            summary = apply_policy(document, dry_run=options['dry_run'])
+        except PolicyError as e:
+            raise CommandError(json.dumps(e.errors, ensure_ascii=False, indent=2))
+        
+        for section, counts in summary.items():
+            self.stdout.write(
+                f'{section}: +{counts["created"]} ~{counts["updated"]} -{counts["deleted"]}'
+            )
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('Dry run, nothing changed / Пробный запуск, ничего не изменено'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Policy applied / Политика применена'))
@@ -0,0 +1,20 @@
+"""
+Rebuild action bit positions and role permission masks.
+Перестроение позиций битов действий и масок прав ролей.
+"""
+from django.core.management.base import BaseCommand
+from access.cache import bump_global_epoch
+from access.masks import rebuild_masks
+
+
+class Command(BaseCommand):
+    """
+    Rebuild masks from Permission rows, e.g. after bulk imports that skip signals.
+    Перестроение масок по записям Permission, например после массового импорта без сигналов.
+    """
+    help = 'Rebuild role permission masks / Перестроение масок прав ролей'
+    
+    def handle(self, *args, **options):
+        masks = rebuild_masks()
+        bump_global_epoch()
+        self.stdout.write(self.style.SUCCESS(f'Masks rebuilt: {masks} rows / Маски перестроены: {masks} строк'))
@@ -0,0 +1,20 @@
+"""
+Rebuild the role hierarchy closure table.
+Перестроение таблицы замыкания иерархии ролей.
+"""
+from django.core.management.base import BaseCommand
+from access.cache import bump_global_epoch
+from access.closure import rebuild_closure
+
+
+class Command(BaseCommand):
+    """
+    Rebuild closure from Role.parent, e.g. after bulk imports that skip signals.
+    Перестроение замыкания по Role.parent, например после массового импорта без сигналов.
+    """
+    help = 'Rebuild role hierarchy closure table / Перестроение замыкания иерархии ролей'
+    
+    def handle(self, *args, **options):
+        rows = rebuild_closure()
+        bump_global_epoch()
+        self.stdout.write(self.style.SUCCESS(f'Closure rebuilt: {rows} rows / Замыкание перестроено: {rows} строк'))
@@ -0,0 +1,150 @@
+"""
+Wildcard permission patterns and their compiled matcher.
+Шаблоны прав доступа с подстановкой и их скомпилированный матчер.
+
+Patterns are regular Resource/Action rows with "*" in the name:
+- action "*"                  — any action on the resource ("reports:*")
+- resource "*"                — the action on any resource ("*:read")
+- resource "projects.alpha.*" — any resource below the dotted prefix
+Шаблоны — обычные записи Resource/Action со "*" в имени:
+- действие "*"                — любое действие над ресурсом ("reports:*")
+- ресурс "*"                  — действие над любым ресурсом ("*:read")
+- ресурс "projects.alpha.*"   — любой ресурс ниже префикса через точку
+
+Patterns are compiled into a trie over dotted resource segments whose nodes
+hold action bitmasks, so a check walks at most depth-of-resource nodes.
+Шаблоны компилируются в префиксное дерево по сегментам имени ресурса, узлы
+которого хранят битовые маски действий, поэтому проверка проходит не больше
+узлов, чем сегментов в имени ресурса.
+"""
+import re
+from django.core.exceptions import ValidationError
+
+WILDCARD = '*'
+ALL_ACTIONS = -1
+
+RESOURCE_NAME_RE = re.compile(r'^(\*|[^.*]+(\.[^.*]+)*(\.\*)?)$')
+
+
+def validate_resource_name(name):
+    """
+    Allow "*" only as the whole name or as the last dotted segment.
+    "*" допускается только как имя целиком или последний сегмент через точку.
+    """
+    if not RESOURCE_NAME_RE.match(name):
+        raise ValidationError(
+            'Use dotted segments, "*" only as the last segment (e.g. "projects.*"). / '
+            'Используйте сегменты через точку, "*" только последним сегментом (например "projects.*").'
+        )
+
+
+def validate_action_name(name):
+    """
+    Allow "*" only as the whole name.
+    "*" допускается только как имя целиком.
+    """
+    if WILDCARD in name and name != WILDCARD:
+        raise ValidationError('Use "*" only as the whole action name. / '
+                              'Используйте "*" только как имя действия целиком.')
+
+
+def is_pattern(resource_name, action_name):
+    return WILDCARD in resource_name or action_name == WILDCARD
+
+
+class TrieNode:
+    """
+    Resource trie node: exact grants on this resource and grants on everything below it.
+    Узел дерева ресурсов: права на сам ресурс и на все ресурсы ниже него.
+    """
+    __slots__ = ('children', 'exact', 'subtree')
+    
+    def __init__(self):
+        self.children = {}
+        self.exact = 0
+        self.subtree = 0
+    
+    def __getstate__(self):
+        return self.children, self.exact, self.subtree
+    
+    def __setstate__(self, state):
+        self.children, self.exact, self.subtree = state
+
+
+def _covers(mask, bit):
+    return mask == ALL_ACTIONS or mask & bit != 0
+
+
+class PatternMatcher:
+    """
+    Compiled wildcard patterns: resource trie plus action bitmasks.
+    Скомпилированные шаблоны: дерево ресурсов и битовые маски действий.
+    """
+    
+    def __init__(self, patterns):
+        self.root = TrieNode()
+        self.action_bits = {}
+        for resource_name, action_name in patterns:
+            self.add(resource_name, action_name)
+    
+    def add(self, resource_name, action_name):
+        if action_name == WILDCARD:
+            mask = ALL_ACTIONS
+        else:
+            mask = self.action_bits.setdefault(action_name, 1 << len(self.action_bits))
+        
+        node = self.root
+        segments = resource_name.split('.')
+        for segment in segments[:-1]:
+            node = node.children.setdefault(segment, TrieNode())
+        if segments[-1] == WILDCARD:
+            node.subtree |= mask
+        else:
+            node = node.children.setdefault(segments[-1], TrieNode())
+            node.exact |= mask
+    
+    def match(self, resource_name, action_name):
+        """
+        Check (resource, action) against the patterns in O(depth of resource name).
+        Проверка (ресурс, действие) по шаблонам за O(глубины имени ресурса).
+        """
+        bit = self.action_bits.get(action_name, 0)
+        node = self.root
+        for segment in resource_name.split('.'):
+            if _covers(node.subtree, bit):
+                return True
+            node = node.children.get(segment)
+            if node is None:
+                return False
+        return _covers(node.exact, bit)
+
+
+class PermissionSet(frozenset):
+    """
+    Compiled permission set: exact (resource, action) pairs plus a matcher
+    for wildcard pairs, used wherever a frozenset of pairs was used before.
+    Скомпилированный набор прав: точные пары (ресурс, действие) и матчер
+    для пар с подстановкой, используется везде, где раньше был frozenset пар.
+    """
+    
+    def __new__(cls, pairs=()):
+        self = super().__new__(cls, pairs)
+        patterns = [pair for pair in self if is_pattern(*pair)]
+        self.matcher = PatternMatcher(patterns) if patterns else None
+        return self
+    
+    def __contains__(self, pair):
+        if frozenset.__contains__(self, pair):
+            return True
+        return self.matcher is not None and self.matcher.match(*pair)
+    
+    def __reduce__(self):
+        # Keep the compiled matcher when unpickled from the cache.
+        # Сохранение скомпилированного матчера при чтении из кэша.
+        return _restore_permission_set, (frozenset(self), self.matcher)
+
+
+def _restore_permission_set(pairs, matcher):
+    permission_set = frozenset.__new__(PermissionSet, pairs)
+    permission_set.matcher = matcher
+    return permission_set
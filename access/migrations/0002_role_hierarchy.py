@@ -0,0 +1,115 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def create_self_links(apps, schema_editor):
+    Role = apps.get_model("access", "Role")
+    RoleClosure = apps.get_model("access", "RoleClosure")
+    RoleClosure.objects.bulk_create(
+        [
+            RoleClosure(ancestor_id=role_id, descendant_id=role_id, depth=0)
+            for role_id in Role.objects.values_list("id", flat=True)
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("access", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="action",
+            options={
+                "ordering": ["name"],
+                "verbose_name": "Action / Действие",
+                "verbose_name_plural": "Actions / Действия",
+            },
+        ),
+        migrations.AlterModelOptions(
+            name="permission",
+            options={
+                "ordering": ["role", "resource", "action"],
+                "verbose_name": "Permission / Право доступа",
+                "verbose_name_plural": "Permissions / Права доступа",
+            },
+        ),
+        migrations.AlterModelOptions(
+            name="resource",
+            options={
+                "ordering": ["name"],
+                "verbose_name": "Resource / Ресурс",
+                "verbose_name_plural": "Resources / Ресурсы",
+            },
+        ),
+        migrations.AlterModelOptions(
+            name="role",
+            options={
+                "ordering": ["name"],
+                "verbose_name": "Role / Роль",
+                "verbose_name_plural": "Roles / Роли",
+            },
+        ),
+        migrations.AlterModelOptions(
+            name="userrole",
+            options={
+                "ordering": ["user", "role"],
+                "verbose_name": "User Role / Роль пользователя",
+                "verbose_name_plural": "User Roles / Роли пользователей",
+            },
+        ),
+        migrations.AddField(
+            model_name="role",
+            name="parent",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Role inherits all permissions of its parent / Роль наследует все права родителя",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="children",
+                to="access.role",
+            ),
+        ),
+        migrations.CreateModel(
+            name="RoleClosure",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("depth", models.PositiveIntegerField()),
+                (
+                    "ancestor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="descendant_links",
+                        to="access.role",
+                    ),
+                ),
+                (
+                    "descendant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ancestor_links",
+                        to="access.role",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Role Closure / Замыкание ролей",
+                "verbose_name_plural": "Role Closure / Замыкание ролей",
+                "db_table": "role_closure",
+                "unique_together": {("descendant", "ancestor")},
+            },
+        ),
+        migrations.RunPython(create_self_links, migrations.RunPython.noop),
+    ]
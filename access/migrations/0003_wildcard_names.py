@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:50
+
+import access.matching
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("access", "0002_role_hierarchy"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="action",
+            name="name",
+            field=models.CharField(
+                db_index=True,
+                max_length=50,
+                unique=True,
+                validators=[access.matching.validate_action_name],
+            ),
+        ),
+        migrations.AlterField(
+            model_name="resource",
+            name="name",
+            field=models.CharField(
+                db_index=True,
+                max_length=100,
+                unique=True,
+                validators=[access.matching.validate_resource_name],
+            ),
+        ),
+    ]
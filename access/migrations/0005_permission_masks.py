@@ -0,0 +1,81 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_masks(apps, schema_editor):
+    Action = apps.get_model("access", "Action")
+    Permission = apps.get_model("access", "Permission")
+    RolePermissionMask = apps.get_model("access", "RolePermissionMask")
+    for bit, action_id in enumerate(Action.objects.order_by("id").values_list("id", flat=True)):
+        Action.objects.filter(pk=action_id).update(bit=bit)
+    masks = {}
+    rows = Permission.objects.values_list("role_id", "resource_id", "action__bit")
+    for role_id, resource_id, bit in rows:
+        masks[role_id, resource_id] = masks.get((role_id, resource_id), 0) | (1 << bit)
+    RolePermissionMask.objects.bulk_create(
+        [
+            RolePermissionMask(role_id=role_id, resource_id=resource_id, actions=mask)
+            for (role_id, resource_id), mask in masks.items()
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("access", "0004_object_permissions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="action",
+            name="bit",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                editable=False,
+                help_text="Stable bit position in permission masks / Постоянная позиция бита в масках прав",
+                null=True,
+                unique=True,
+            ),
+        ),
+        migrations.CreateModel(
+            name="RolePermissionMask",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("actions", models.BigIntegerField(default=0)),
+                (
+                    "resource",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="permission_masks",
+                        to="access.resource",
+                    ),
+                ),
+                (
+                    "role",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="permission_masks",
+                        to="access.role",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Permission Mask / Маска прав",
+                "verbose_name_plural": "Permission Masks / Маски прав",
+                "db_table": "role_permission_masks",
+                "unique_together": {("role", "resource")},
+            },
+        ),
+        migrations.RunPython(build_masks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("access", "0005_permission_masks"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="permission",
+            index=models.Index(
+                fields=["resource", "role", "action"],
+                name="permissions_resource_role_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userrole",
+            index=models.Index(
+                fields=["role", "user"], name="user_roles_role_user_idx"
+            ),
+        ),
+    ]
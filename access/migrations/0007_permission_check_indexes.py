@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("access", "0006_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="roleclosure",
+            name="ancestor",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="descendant_links",
+                to="access.role",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="rolepermissionmask",
+            name="role",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="permission_masks",
+                to="access.role",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="roleclosure",
+            index=models.Index(
+                fields=["ancestor", "descendant"], name="role_closure_ancestor_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rolepermissionmask",
+            index=models.Index(
+                fields=["role", "resource", "actions"], name="masks_role_covering_idx"
+            ),
+        ),
+    ]
@@ -2,8 +2,10 @@
 Custom access control models.
 Модели кастомной системы контроля доступа.
 """
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.conf import settings
+from .matching import validate_resource_name, validate_action_name
 
 
 class Role(models.Model):
@@ -13,6 +15,10 @@ class Role(models.Model):
     """
     name = models.CharField(max_length=100, unique=True, db_index=True)
     description = models.TextField(blank=True)
+    parent = models.ForeignKey(
+        'self', on_delete=models.SET_NULL, null=True, blank=True, related_name='children',
+        help_text='Role inherits all permissions of its parent / Роль наследует все права родителя'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -24,14 +30,53 @@ class Role(models.Model):
     
     def __str__(self):
         return self.name
+    
+    def clean(self):
+        """
+        Reject a parent that would create a cycle in the hierarchy.
+        Запрет родителя, который создает цикл в иерархии.
+        """
+        if self.parent_id is None or self.pk is None:
+            return
+        if RoleClosure.objects.filter(ancestor_id=self.pk, descendant_id=self.parent_id).exists():
+            raise ValidationError({
+                'parent': 'Role cannot inherit from itself or its descendant. / '
+                          'Роль не может наследовать от себя или своего потомка.'
+            })
+
+
+class RoleClosure(models.Model):
+    """
+    Transitive closure of the role hierarchy: descendant inherits permissions
+    of ancestor. Every role has a row to itself with depth 0.
+    Транзитивное замыкание иерархии ролей: потомок наследует права предка.
+    У каждой роли есть строка на саму себя с глубиной 0.
+    """
+    # Indexed by role_closure_ancestor_idx / Индексируется role_closure_ancestor_idx
+    ancestor = models.ForeignKey(Role, on_delete=models.CASCADE, related_name='descendant_links', db_index=False)
+    descendant = models.ForeignKey(Role, on_delete=models.CASCADE, related_name='ancestor_links')
+    depth = models.PositiveIntegerField()
+    
+    class Meta:
+        db_table = 'role_closure'
+        verbose_name = 'Role Closure / Замыкание ролей'
+        verbose_name_plural = 'Role Closure / Замыкание ролей'
+        unique_together = [['descendant', 'ancestor']]
+        # Covering index for ancestor -> descendants (invalidation) / Покрывающий индекс предок -> потомки (инвалидация)
+        indexes = [models.Index(fields=['ancestor', 'descendant'], name='role_closure_ancestor_idx')]
+    
+    def __str__(self):
+        return f'{self.descendant_id} -> {self.ancestor_id} ({self.depth})'
 
 
 class Resource(models.Model):
     """
     Resource that can be accessed (e.g., projects, reports, users).
+    Dotted names with a trailing "*" are patterns (e.g., projects.alpha.*, *).
     Ресурс, к которому может быть предоставлен доступ (например, projects, reports, users).
+    Имена через точку с "*" в конце — шаблоны (например, projects.alpha.*, *).
     """
-    name = models.CharField(max_length=100, unique=True, db_index=True)
+    name = models.CharField(max_length=100, unique=True, db_index=True, validators=[validate_resource_name])
     description = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -49,10 +94,16 @@ class Resource(models.Model):
 class Action(models.Model):
     """
     Action that can be performed on a resource (e.g., read, create, update, delete).
+    Action "*" is a pattern matching any action.
     Действие, которое может быть выполнено над ресурсом (например, read, create, update, delete).
+    Действие "*" — шаблон, соответствующий любому действию.
     """
-    name = models.CharField(max_length=50, unique=True, db_index=True)
+    name = models.CharField(max_length=50, unique=True, db_index=True, validators=[validate_action_name])
     description = models.TextField(blank=True)
+    bit = models.PositiveSmallIntegerField(
+        unique=True, null=True, blank=True, editable=False,
+        help_text='Stable bit position in permission masks / Постоянная позиция бита в масках прав'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -80,12 +131,38 @@ class Permission(models.Model):
         verbose_name = 'Permission / Право доступа'
         verbose_name_plural = 'Permissions / Права доступа'
         unique_together = [['role', 'resource', 'action']]
+        # Keyset pages of one resource / Keyset-страницы одного ресурса
+        indexes = [models.Index(fields=['resource', 'role', 'action'], name='permissions_resource_role_idx')]
         ordering = ['role', 'resource', 'action']
     
     def __str__(self):
         return f'{self.role.name} can {self.action.name} {self.resource.name} / {self.role.name} может {self.action.name} {self.resource.name}'
 
 
+class RolePermissionMask(models.Model):
+    """
+    Compact form of Permission rows: one row per (role, resource) with a bitmask
+    of granted actions (bit positions from Action.bit). Maintained from Permission.
+    Компактная форма записей Permission: одна строка на (роль, ресурс) с битовой
+    маской разрешенных действий (позиции битов из Action.bit). Обновляется по Permission.
+    """
+    # Indexed by unique_together and masks_role_covering_idx / Индексируется unique_together и masks_role_covering_idx
+    role = models.ForeignKey(Role, on_delete=models.CASCADE, related_name='permission_masks', db_index=False)
+    resource = models.ForeignKey(Resource, on_delete=models.CASCADE, related_name='permission_masks')
+    actions = models.BigIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'role_permission_masks'
+        verbose_name = 'Permission Mask / Маска прав'
+        verbose_name_plural = 'Permission Masks / Маски прав'
+        unique_together = [['role', 'resource']]
+        # Covering index for permission compilation / Покрывающий индекс для компиляции прав
+        indexes = [models.Index(fields=['role', 'resource', 'actions'], name='masks_role_covering_idx')]
+    
+    def __str__(self):
+        return f'{self.role_id}:{self.resource_id} = {self.actions:b}'
+
+
 class UserRole(models.Model):
     """
     Many-to-many relationship between User and Role.
@@ -100,7 +177,32 @@ class UserRole(models.Model):
         verbose_name = 'User Role / Роль пользователя'
         verbose_name_plural = 'User Roles / Роли пользователей'
         unique_together = [['user', 'role']]
+        # Keyset pages of one role / Keyset-страницы одной роли
+        indexes = [models.Index(fields=['role', 'user'], name='user_roles_role_user_idx')]
         ordering = ['user', 'role']
     
     def __str__(self):
         return f'{self.user.email} - {self.role.name}'
+
+
+class ObjectPermission(models.Model):
+    """
+    Object-level rule: User can perform Action on one object of Resource.
+    Правило на уровне объекта: Пользователь может выполнить Действие над одним объектом Ресурса.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='object_permissions')
+    resource = models.ForeignKey(Resource, on_delete=models.CASCADE, related_name='object_permissions')
+    action = models.ForeignKey(Action, on_delete=models.CASCADE, related_name='object_permissions')
+    object_id = models.PositiveBigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'object_permissions'
+        verbose_name = 'Object Permission / Право на объект'
+        verbose_name_plural = 'Object Permissions / Права на объекты'
+        unique_together = [['user', 'resource', 'action', 'object_id']]
+        ordering = ['user', 'resource', 'action', 'object_id']
+    
+    def __str__(self):
+        return (f'{self.user.email} can {self.action.name} {self.resource.name} #{self.object_id} / '
+                f'{self.user.email} может {self.action.name} {self.resource.name} #{self.object_id}')
@@ -2,8 +2,25 @@
 Custom permission classes for access control.
 Кастомные классы разрешений для контроля доступа.
 """
-from rest_framework import permissions
-from .models import Permission, UserRole
+import functools
+import inspect
+import time
+from rest_framework import exceptions, permissions
+from rest_framework.views import APIView
+from core.metrics import PERMISSION_CHECK_SECONDS, PERMISSION_DECISIONS
+from .cache import get_user_permissions, aget_user_permissions, get_global_epoch, aget_global_epoch
+from .models import ObjectPermission
+from .registry import get_names, aget_names
+
+METHOD_ACTIONS = {
+    'GET': 'read',
+    'HEAD': 'read',
+    'OPTIONS': 'read',
+    'POST': 'create',
+    'PUT': 'update',
+    'PATCH': 'update',
+    'DELETE': 'delete',
+}
 
 
 class HasResourcePermission(permissions.BasePermission):
@@ -34,13 +51,125 @@ class HasResourcePermission(permissions.BasePermission):
         if not resource_name or not action_name:
             return False
         
-        user_roles = UserRole.objects.filter(
-            user=request.user,
-            role__permissions__resource__name=resource_name,
-            role__permissions__action__name=action_name
-        ).exists()
+        return self.decide(request.user, (resource_name, action_name))
+    
+    def decide(self, user, key):
+        """
+        Look up a (resource, action) key in the compiled set and record metrics.
+        Поиск ключа (ресурс, действие) в скомпилированном наборе и запись метрик.
+        """
+        started = time.perf_counter()
+        allowed = key in get_user_permissions(user)
+        PERMISSION_CHECK_SECONDS.observe(time.perf_counter() - started, resource=key[0], action=key[1])
+        PERMISSION_DECISIONS.inc(resource=key[0], action=key[1], decision='allow' if allowed else 'deny')
+        return allowed
+
+
+class ResolvedResourcePermission(HasResourcePermission):
+    """
+    HasResourcePermission with keys resolved when the class is built:
+    request method -> (resource, action). Built by resource_permission().
+    HasResourcePermission с ключами, вычисленными при создании класса:
+    метод запроса -> (ресурс, действие). Создается через resource_permission().
+    """
+    keys = {}
+    
+    def has_permission(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return False
+        key = self.keys.get(request.method)
+        return key is not None and self.decide(request.user, key)
+
+
+def resource_permission(resource_name, action_name=None, **methods):
+    """
+    Build a permission class for a resource. With action_name every method
+    requires that action, otherwise methods map by METHOD_ACTIONS, overridden
+    by keyword arguments (e.g. POST='publish').
+    Создание класса разрешений для ресурса. С action_name любой метод требует
+    это действие, иначе методы сопоставляются по METHOD_ACTIONS с заменой
+    через именованные аргументы (например, POST='publish').
+    """
+    if action_name is not None:
+        actions = dict.fromkeys(METHOD_ACTIONS, action_name)
+    else:
+        actions = {**METHOD_ACTIONS, **{method.upper(): action for method, action in methods.items()}}
+    keys = {method: (resource_name, action) for method, action in actions.items() if action}
+    name = f'{resource_name.title().replace("_", "")}Permission'
+    return type(name, (ResolvedResourcePermission,), {'keys': keys, '__module__': __name__})
+
+
+def _attach_to_view_class(cls, permission):
+    """
+    Append the permission class to permission_classes of an APIView subclass.
+    Добавление класса разрешений в permission_classes подкласса APIView.
+    """
+    if not issubclass(cls, APIView):
+        raise TypeError(f'@requires expects an APIView subclass, got {cls!r} / '
+                        f'@requires ожидает подкласс APIView, получено {cls!r}')
+    cls.permission_classes = [*cls.permission_classes, permission]
+
+
+def _wrap_handler(view, check):
+    """
+    Wrap a view function or method (first parameter "self") with the check.
+    Обертывание функции или метода представления (первый параметр "self") проверкой.
+    """
+    if not callable(view) or not inspect.signature(view).parameters:
+        raise TypeError(f'@requires cannot be applied to {view!r} / @requires нельзя применить к {view!r}')
+    
+    if next(iter(inspect.signature(view).parameters)) == 'self':
+        @functools.wraps(view)
+        def wrapper(self, request, *args, **kwargs):
+            check(request, self)
+            return view(self, request, *args, **kwargs)
+    else:
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            check(request, None)
+            return view(request, *args, **kwargs)
+    return wrapper
+
+
+def requires(resource_name, action_name=None, **methods):
+    """
+    Declare the resource permission of a view, arguments as in resource_permission().
+    On APIView/ViewSet classes the permission class is appended to
+    permission_classes. Functions and methods (including @action, above or
+    below it) are wrapped to check before the handler runs, so the view's own
+    permission classes (e.g. IsAdminPermission) still apply.
+    Объявление права на ресурс для представления, аргументы как в resource_permission().
+    Для классов APIView/ViewSet класс разрешений добавляется в permission_classes.
+    Функции и методы (включая @action, выше или ниже него) оборачиваются
+    проверкой перед обработчиком, поэтому собственные классы разрешений
+    представления (например, IsAdminPermission) продолжают действовать.
+    
+    Example / Пример:
+        @api_view(['GET'])
+        @requires('reports', 'read')
+        def reports(request): ...
         
-        return user_roles
+        @requires('projects')  # GET -> read, POST -> create, DELETE -> delete ...
+        class ProjectViewSet(viewsets.ModelViewSet): ...
+    """
+    permission = resource_permission(resource_name, action_name, **methods)
+    checker = permission()
+    
+    def check(request, view):
+        if checker.has_permission(request, view):
+            return
+        if view is not None:
+            view.permission_denied(request)
+        if not request.user or not request.user.is_authenticated:
+            raise exceptions.NotAuthenticated()
+        raise exceptions.PermissionDenied()
+    
+    def decorator(view):
+        if isinstance(view, type) or hasattr(view, 'cls'):
+            _attach_to_view_class(getattr(view, 'cls', view), permission)
+            return view
+        return _wrap_handler(view, check)
+    return decorator
 
 
 def check_user_permission(user, resource_name, action_name):
@@ -60,8 +189,105 @@ def check_user_permission(user, resource_name, action_name):
     if not user or not user.is_authenticated:
         return False
     
-    return UserRole.objects.filter(
-        user=user,
-        role__permissions__resource__name=resource_name,
-        role__permissions__action__name=action_name
-    ).exists()
+    return (resource_name, action_name) in get_user_permissions(user)
+
+
+async def acheck_user_permission(user, resource_name, action_name):
+    """
+    Async variant of check_user_permission for async views.
+    Асинхронный вариант check_user_permission для асинхронных представлений.
+    """
+    if not user or not user.is_authenticated:
+        return False
+    
+    return (resource_name, action_name) in await aget_user_permissions(user)
+
+
+def check_user_permissions(user, pairs):
+    """
+    Utility function to check a batch of permissions at once.
+    Утилитная функция для проверки набора прав за один раз.
+    
+    Args:
+        user: User instance / Экземпляр пользователя
+        pairs: Iterable of (resource_name, action_name) / Итерируемый объект пар (имя ресурса, имя действия)
+    
+    Returns:
+        dict: Mapping (resource_name, action_name) -> bool
+        Словарь (имя ресурса, имя действия) -> bool
+    """
+    granted = get_user_permissions(user)
+    return {(resource_name, action_name): (resource_name, action_name) in granted
+            for resource_name, action_name in pairs}
+
+
+def object_permissions_queryset(user, resource_name, action_name, names=None):
+    """
+    Queryset of object ids the user was granted the action on, one by one.
+    Names are resolved to ids in memory, so the query has no joins.
+    Queryset id объектов, на которые пользователю выдано действие поштучно.
+    Имена переводятся в id в памяти, поэтому в запросе нет соединений.
+    """
+    if names is None:
+        names = get_names(get_global_epoch())
+    resource_id, action_id = names.resource_id(resource_name), names.action_id(action_name)
+    if resource_id is None or action_id is None:
+        return ObjectPermission.objects.none().values_list('object_id', flat=True)
+    return ObjectPermission.objects.filter(
+        user_id=user.pk, resource_id=resource_id, action_id=action_id
+    ).values_list('object_id', flat=True)
+
+
+def filter_permitted(queryset, user, resource_name, action_name):
+    """
+    Narrow queryset to objects the user may access, in one SQL predicate:
+    everything with a type-level permission, otherwise objects granted individually.
+    Сужение queryset до доступных пользователю объектов одним SQL-условием:
+    все объекты при праве на тип ресурса, иначе выданные поштучно.
+    
+    Example / Пример:
+        filter_permitted(Project.objects.all(), request.user, 'projects', 'read')
+    """
+    if not user or not user.is_authenticated:
+        return queryset.none()
+    if check_user_permission(user, resource_name, action_name):
+        return queryset
+    return queryset.filter(pk__in=object_permissions_queryset(user, resource_name, action_name))
+
+
+def permitted_object_ids(user, resource_name, action_name):
+    """
+    Ids of objects the user may access, None when all are (type-level permission).
+    Id доступных пользователю объектов, None если доступны все (право на тип ресурса).
+    """
+    if check_user_permission(user, resource_name, action_name):
+        return None
+    if not user or not user.is_authenticated:
+        return set()
+    return set(object_permissions_queryset(user, resource_name, action_name))
+
+
+async def apermitted_object_ids(user, resource_name, action_name):
+    """
+    Async variant of permitted_object_ids.
+    Асинхронный вариант permitted_object_ids.
+    """
+    if await acheck_user_permission(user, resource_name, action_name):
+        return None
+    if not user or not user.is_authenticated:
+        return set()
+    names = await aget_names(await aget_global_epoch())
+    queryset = object_permissions_queryset(user, resource_name, action_name, names)
+    return {object_id async for object_id in queryset}
+
+
+def check_object_permission(user, resource_name, action_name, object_id):
+    """
+    Check permission on a single object: type-level or granted for the object.
+    Проверка права на один объект: на тип ресурса или выданного на этот объект.
+    """
+    if check_user_permission(user, resource_name, action_name):
+        return True
+    if not user or not user.is_authenticated:
+        return False
+    return object_permissions_queryset(user, resource_name, action_name).filter(object_id=object_id).exists()
@@ -0,0 +1,387 @@
+"""
+Import and export of the whole access control policy as one JSON document.
+Импорт и экспорт всей политики контроля доступа одним JSON-документом.
+
+Document / Документ:
+    {
+        "roles": [{"name": "admin", "description": "", "parent": "user"}],
+        "resources": [{"name": "projects", "description": ""}],
+        "actions": [{"name": "read", "description": ""}],
+        "permissions": [{"role": "admin", "resource": "projects", "action": "read"}],
+        "user_roles": [{"user": "admin@example.com", "role": "admin"}]
+    }
+
+Every section present in the document is the full desired state: missing rows
+are created, changed ones updated and rows absent from the section deleted.
+Omitted sections are left as they are. The diff is applied in one transaction
+with bulk_create/bulk_update and set-based deletes, then the role closure and
+permission masks are rebuilt and the global epoch is bumped once.
+Каждый раздел документа — полное желаемое состояние: недостающие строки
+создаются, измененные обновляются, а отсутствующие в разделе удаляются.
+Пропущенные разделы не меняются. Разница применяется в одной транзакции
+через bulk_create/bulk_update и удаление множествами, затем перестраиваются
+замыкание ролей и маски прав, а глобальная эпоха увеличивается один раз.
+"""
+import json
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from users.models import User
+from .cache import bump_global_epoch
+from .closure import rebuild_closure
+from .masks import rebuild_masks, MAX_ACTION_BITS
+from .matching import validate_resource_name, validate_action_name
+from .models import Role, Resource, Action, Permission, UserRole
+from .signals import invalidation_suspended
+
+SECTIONS = ('roles', 'resources', 'actions', 'permissions', 'user_roles')
+BATCH_SIZE = 1000
+EXPORT_CHUNK_ROWS = 500
+
+
+class PolicyError(ValueError):
+    """
+    Invalid policy document, errors is {section: [messages]}.
+    Некорректный документ политики, errors — {раздел: [сообщения]}.
+    """
+    
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def _batches(items, size=BATCH_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _text(item, key, errors, section, index, required=True, max_length=None):
+    value = item.get(key)
+    if value is None and not required:
+        return ''
+    if not isinstance(value, str) or (required and not value):
+        errors.setdefault(section, []).append(f'{index}: "{key}" must be a non-empty string / '
+                                              f'"{key}" должен быть непустой строкой')
+        return None
+    if max_length and len(value) > max_length:
+        errors.setdefault(section, []).append(f'{index}: "{key}" is longer than {max_length} / '
+                                              f'"{key}" длиннее {max_length}')
+        return None
+    return value
+
+
+def _validate_name(validator, name, errors, section, index):
+    try:
+        validator(name)
+    except ValidationError as e:
+        errors.setdefault(section, []).append(f'{index}: {" ".join(e.messages)}')
+
+
+def _parse_named(items, errors, section, max_length, validator=None, with_parent=False):
+    """
+    Rows of a name/description section as {name: {'description', 'parent'}}.
+    Строки раздела имя/описание в виде {имя: {'description', 'parent'}}.
+    """
+    rows = {}
+    for index, item in enumerate(items):
+        name = _text(item, 'name', errors, section, index, max_length=max_length)
+        description = _text(item, 'description', errors, section, index, required=False)
+        parent = _text(item, 'parent', errors, section, index, required=False) if with_parent else ''
+        if name is None or description is None or parent is None:
+            continue
+        if validator is not None:
+            _validate_name(validator, name, errors, section, index)
+        if name in rows:
+            errors.setdefault(section, []).append(f'{index}: duplicate name "{name}" / '
+                                                  f'повторяющееся имя "{name}"')
+        rows[name] = {'description': description, 'parent': parent or None}
+    return rows
+
+
+def _parse_links(items, errors, section, keys):
+    """
+    Rows of a link section as a set of tuples of names.
+    Строки раздела связей в виде множества кортежей имен.
+    """
+    rows = set()
+    for index, item in enumerate(items):
+        row = tuple(_text(item, key, errors, section, index) for key in keys)
+        if None not in row:
+            rows.add(row)
+    return rows
+
+
+def _check_role_tree(roles, errors):
+    """
+    Report unknown parents and cycles of the role hierarchy.
+    Сообщение о неизвестных родителях и циклах в иерархии ролей.
+    """
+    for name, row in roles.items():
+        if row['parent'] is not None and row['parent'] not in roles:
+            errors.setdefault('roles', []).append(f'{name}: unknown parent "{row["parent"]}" / '
+                                                  f'неизвестный родитель "{row["parent"]}"')
+    for name in roles:
+        seen, current = set(), name
+        while current is not None and current in roles and current not in seen:
+            seen.add(current)
+            current = roles[current]['parent']
+        if current in seen:
+            errors.setdefault('roles', []).append(f'{name}: role hierarchy has a cycle / '
+                                                  f'в иерархии ролей есть цикл')
+            break
+
+
+def _parse_roles(items, errors):
+    roles = _parse_named(items, errors, 'roles', 100, with_parent=True)
+    _check_role_tree(roles, errors)
+    return roles
+
+
+def _parse_resources(items, errors):
+    return _parse_named(items, errors, 'resources', 100, validate_resource_name)
+
+
+def _parse_actions(items, errors):
+    actions = _parse_named(items, errors, 'actions', 50, validate_action_name)
+    if len(actions) > MAX_ACTION_BITS:
+        errors.setdefault('actions', []).append(f'At most {MAX_ACTION_BITS} actions are supported / '
+                                                f'Поддерживается не более {MAX_ACTION_BITS} действий')
+    return actions
+
+
+def _parse_permissions(items, errors):
+    return _parse_links(items, errors, 'permissions', ('role', 'resource', 'action'))
+
+
+def _parse_user_roles(items, errors):
+    return _parse_links(items, errors, 'user_roles', ('user', 'role'))
+
+
+PARSERS = {
+    'roles': _parse_roles,
+    'resources': _parse_resources,
+    'actions': _parse_actions,
+    'permissions': _parse_permissions,
+    'user_roles': _parse_user_roles,
+}
+
+
+def parse_policy(document):
+    """
+    Validate document structure, returns {section: normalized rows} for sections present.
+    Проверка структуры документа, возвращает {раздел: нормализованные строки} для имеющихся разделов.
+    """
+    if not isinstance(document, dict):
+        raise PolicyError({'document': ['Expected a JSON object / Ожидается JSON-объект']})
+    unknown = set(document) - set(SECTIONS)
+    errors = {}
+    if unknown:
+        errors['document'] = [f'Unknown section "{name}" / Неизвестный раздел "{name}"' for name in sorted(unknown)]
+    
+    policy = {}
+    for section in SECTIONS:
+        if section not in document:
+            continue
+        items = document[section]
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            errors.setdefault(section, []).append('Expected a list of objects / Ожидается список объектов')
+            continue
+        policy[section] = PARSERS[section](items, errors)
+    if errors:
+        raise PolicyError(errors)
+    return policy
+
+
+def _sync_named(model, rows):
+    """
+    Sync name/description rows of a model, returns counts.
+    Синхронизация строк имя/описание модели, возвращает счетчики.
+    """
+    existing = {obj.name: obj for obj in model.objects.only('id', 'name', 'description')}
+    now = timezone.now()
+    has_updated_at = any(field.name == 'updated_at' for field in model._meta.concrete_fields)
+    update_fields = ['description', 'updated_at'] if has_updated_at else ['description']
+    
+    created = [model(name=name, description=row['description']) for name, row in rows.items() if name not in existing]
+    updated = []
+    for name, obj in existing.items():
+        if name in rows and obj.description != rows[name]['description']:
+            obj.description = rows[name]['description']
+            obj.updated_at = now
+            updated.append(obj)
+    deleted = [obj.pk for name, obj in existing.items() if name not in rows]
+    
+    for batch in _batches(deleted):
+        model.objects.filter(pk__in=batch).delete()
+    model.objects.bulk_create(created, batch_size=BATCH_SIZE)
+    model.objects.bulk_update(updated, update_fields, batch_size=BATCH_SIZE)
+    return {'created': len(created), 'updated': len(updated), 'deleted': len(deleted)}
+
+
+def _sync_parents(rows, new_names):
+    """
+    Set Role.parent from the document, returns number of changed existing roles.
+    Установка Role.parent по документу, возвращает число измененных существующих ролей.
+    """
+    roles = {role.name: role for role in Role.objects.only('id', 'name', 'parent_id')}
+    changed = []
+    for name, row in rows.items():
+        role = roles[name]
+        parent_id = roles[row['parent']].pk if row['parent'] else None
+        if role.parent_id != parent_id:
+            role.parent_id = parent_id
+            changed.append(role)
+    Role.objects.bulk_update(changed, ['parent'], batch_size=BATCH_SIZE)
+    return sum(1 for role in changed if role.name not in new_names)
+
+
+def _resolve(model, field, key, names, section, errors):
+    """
+    Map names (or emails) to ids, unknown names go to errors.
+    Сопоставление имен (или email) с id, неизвестные имена попадают в errors.
+    """
+    ids = {}
+    for batch in _batches(names):
+        ids.update(model.objects.filter(**{f'{field}__in': batch}).values_list(field, 'id'))
+    for name in sorted(set(names) - set(ids)):
+        errors.setdefault(section, []).append(f'Unknown {key} "{name}" / Неизвестное значение {key} "{name}"')
+    return ids
+
+
+def _sync_links(model, fields, wanted):
+    """
+    Sync link rows (tuples of foreign key ids), returns counts.
+    Синхронизация строк-связей (кортежей id внешних ключей), возвращает счетчики.
+    """
+    existing = {row[:-1]: row[-1] for row in model.objects.order_by().values_list(*fields, 'id').iterator()}
+    deleted = [pk for key, pk in existing.items() if key not in wanted]
+    created = [model(**dict(zip(fields, key))) for key in wanted if key not in existing]
+    for batch in _batches(deleted):
+        model.objects.filter(pk__in=batch).delete()
+    model.objects.bulk_create(created, batch_size=BATCH_SIZE)
+    return {'created': len(created), 'updated': 0, 'deleted': len(deleted)}
+
+
+def _apply_actions(rows, errors):
+    return _sync_named(Action, rows)
+
+
+def _apply_resources(rows, errors):
+    return _sync_named(Resource, rows)
+
+
+def _apply_roles(rows, errors):
+    new_names = set(rows) - set(Role.objects.values_list('name', flat=True))
+    counts = _sync_named(Role, rows)
+    counts['updated'] += _sync_parents(rows, new_names)
+    return counts
+
+
+def _apply_permissions(rows, errors):
+    roles = _resolve(Role, 'name', 'role', {row[0] for row in rows}, 'permissions', errors)
+    resources = _resolve(Resource, 'name', 'resource', {row[1] for row in rows}, 'permissions', errors)
+    actions = _resolve(Action, 'name', 'action', {row[2] for row in rows}, 'permissions', errors)
+    if errors:
+        return None
+    wanted = {(roles[role], resources[resource], actions[action]) for role, resource, action in rows}
+    return _sync_links(Permission, ('role_id', 'resource_id', 'action_id'), wanted)
+
+
+def _apply_user_roles(rows, errors):
+    users = _resolve(User, 'email', 'user', {row[0] for row in rows}, 'user_roles', errors)
+    roles = _resolve(Role, 'name', 'role', {row[1] for row in rows}, 'user_roles', errors)
+    if errors:
+        return None
+    wanted = {(users[user], roles[role]) for user, role in rows}
+    return _sync_links(UserRole, ('user_id', 'role_id'), wanted)
+
+
+# Apply order: names first, links resolve them / Порядок: сначала имена, связи ссылаются на них
+APPLY_STEPS = (
+    ('actions', _apply_actions),
+    ('resources', _apply_resources),
+    ('roles', _apply_roles),
+    ('permissions', _apply_permissions),
+    ('user_roles', _apply_user_roles),
+)
+
+
+def apply_policy(document, dry_run=False):
+    """
+    Apply a policy document as a diff in one transaction.
+    Применение документа политики как разницы в одной транзакции.
+    
+    Args:
+        document: Parsed JSON document / Разобранный JSON-документ
+        dry_run: Roll back after computing the diff / Откат после вычисления разницы
+    
+    Returns:
+        dict: {section: {'created': n, 'updated': n, 'deleted': n}}
+    
+    Raises:
+        PolicyError: Invalid document or unknown names / Некорректный документ или неизвестные имена
+    """
+    policy = parse_policy(document)
+    summary, errors = {}, {}
+    with transaction.atomic(), invalidation_suspended():
+        for section, step in APPLY_STEPS:
+            if section in policy:
+                summary[section] = step(policy[section], errors)
+        if errors:
+            raise PolicyError(errors)
+        
+        if 'roles' in summary:
+            rebuild_closure()
+        if set(summary) - {'user_roles'}:
+            rebuild_masks()
+        if dry_run:
+            transaction.set_rollback(True)
+        else:
+            transaction.on_commit(bump_global_epoch)
+    return summary
+
+
+def _export_rows():
+    yield 'roles', (
+        {'name': name, 'description': description, 'parent': parent}
+        for name, description, parent in Role.objects.order_by('name')
+        .values_list('name', 'description', 'parent__name').iterator()
+    )
+    for section, model in (('resources', Resource), ('actions', Action)):
+        yield section, (
+            {'name': name, 'description': description}
+            for name, description in model.objects.order_by('name').values_list('name', 'description').iterator()
+        )
+    yield 'permissions', (
+        {'role': role, 'resource': resource, 'action': action}
+        for role, resource, action in Permission.objects.order_by('id')
+        .values_list('role__name', 'resource__name', 'action__name').iterator(chunk_size=2000)
+    )
+    yield 'user_roles', (
+        {'user': email, 'role': role}
+        for email, role in UserRole.objects.order_by('id')
+        .values_list('user__email', 'role__name').iterator(chunk_size=2000)
+    )
+
+
+def export_policy():
+    """
+    Generate the policy document as JSON text chunks, rows are read with
+    server-side iteration, so memory does not grow with the policy size.
+    Генерация документа политики кусками JSON-текста; строки читаются
+    итератором на стороне сервера, поэтому память не растет с размером политики.
+    """
+    yield '{'
+    for index, (section, rows) in enumerate(_export_rows()):
+        yield f'{", " if index else ""}"{section}": ['
+        chunk, first = [], True
+        for row in rows:
+            chunk.append(json.dumps(row, ensure_ascii=False))
+            if len(chunk) >= EXPORT_CHUNK_ROWS:
+                yield ('' if first else ', ') + ', '.join(chunk)
+                chunk, first = [], False
+        if chunk:
+            yield ('' if first else ', ') + ', '.join(chunk)
+        yield ']'
+    yield '}\n'
@@ -0,0 +1,114 @@
+"""
+Process-local interning of resource and action names.
+Интернирование имен ресурсов и действий в памяти процесса.
+
+Resources and actions are tiny and nearly static, so every process keeps
+name <-> id maps (and action bit positions) in memory and queries filter and
+compile on integer keys without joining resources/actions. A snapshot is
+tied to the global epoch, which create, rename and delete of resources and
+actions bump, so other processes reload on their next check; in the writing
+process signals also drop the snapshot right after commit.
+Ресурсов и действий мало и они почти не меняются, поэтому каждый процесс
+держит в памяти соответствия имя <-> id (и позиции битов действий), а запросы
+фильтруют и компилируют права по целочисленным ключам без соединения с
+resources/actions. Снимок привязан к глобальной эпохе, которую увеличивают
+создание, переименование и удаление ресурсов и действий, поэтому другие
+процессы перечитывают его при следующей проверке; в пишущем процессе сигналы
+также сбрасывают снимок сразу после коммита.
+"""
+import threading
+from dataclasses import dataclass, field
+from django.db.models import F, IntegerField, Value
+from .models import Resource, Action
+
+RESOURCE, ACTION = 0, 1
+
+
+@dataclass(frozen=True)
+class Names:
+    """
+    Immutable snapshot of resource/action names for one epoch.
+    Неизменяемый снимок имен ресурсов/действий для одной эпохи.
+    """
+    epoch: object = None
+    resource_ids: dict = field(default_factory=dict)
+    resource_names: dict = field(default_factory=dict)
+    action_ids: dict = field(default_factory=dict)
+    action_bits: dict = field(default_factory=dict)
+    
+    def resource_id(self, name):
+        return self.resource_ids.get(name)
+    
+    def action_id(self, name):
+        return self.action_ids.get(name)
+
+
+_snapshot = Names()
+_lock = threading.Lock()
+
+
+def names_queryset():
+    """
+    Both tables in one query: (id, name, kind, bit). Both sides select the
+    same annotations, so UNION columns line up (fields come before annotations).
+    Обе таблицы одним запросом: (id, имя, вид, бит). Обе части выбирают
+    одинаковые аннотации, поэтому колонки UNION совпадают (поля идут перед аннотациями).
+    """
+    resources = Resource.objects.order_by().annotate(
+        kind=Value(RESOURCE, output_field=IntegerField()), action_bit=Value(None, output_field=IntegerField())
+    )
+    actions = Action.objects.order_by().annotate(
+        kind=Value(ACTION, output_field=IntegerField()), action_bit=F('bit')
+    )
+    fields = ('id', 'name', 'kind', 'action_bit')
+    return resources.values_list(*fields).union(actions.values_list(*fields), all=True)
+
+
+def _build(epoch, rows):
+    names = Names(epoch=epoch)
+    for pk, name, kind, bit in rows:
+        if kind == RESOURCE:
+            names.resource_ids[name] = pk
+            names.resource_names[pk] = name
+        else:
+            names.action_ids[name] = pk
+            if bit is not None:
+                names.action_bits[bit] = name
+    return names
+
+
+def get_names(epoch):
+    """
+    Names snapshot for the epoch, reloaded once per process when the epoch changes.
+    Снимок имен для эпохи, перечитывается один раз на процесс при смене эпохи.
+    """
+    global _snapshot
+    snapshot = _snapshot
+    if snapshot.epoch == epoch and epoch is not None:
+        return snapshot
+    with _lock:
+        if _snapshot.epoch != epoch or epoch is None:
+            _snapshot = _build(epoch, names_queryset())
+        return _snapshot
+
+
+async def aget_names(epoch):
+    """
+    Async variant of get_names.
+    Асинхронный вариант get_names.
+    """
+    global _snapshot
+    snapshot = _snapshot
+    if snapshot.epoch == epoch and epoch is not None:
+        return snapshot
+    _snapshot = _build(epoch, [row async for row in names_queryset()])
+    return _snapshot
+
+
+def invalidate_names():
+    """
+    Drop the snapshot of this process.
+    Сброс снимка этого процесса.
+    """
+    global _snapshot
+    _snapshot = Names()
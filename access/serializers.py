@@ -3,7 +3,8 @@ Serializers for access app.
 Сериализаторы для приложения access.
 """
 from rest_framework import serializers
-from .models import Role, Resource, Action, Permission, UserRole
+from .masks import has_action
+from .models import Role, RoleClosure, Resource, Action, Permission, RolePermissionMask, UserRole, ObjectPermission
 from users.models import User
 
 
@@ -15,8 +16,8 @@ class ActionSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Action
-        fields = ('id', 'name', 'description', 'created_at')
-        read_only_fields = ('id', 'created_at')
+        fields = ('id', 'name', 'description', 'bit', 'created_at')
+        read_only_fields = ('id', 'bit', 'created_at')
 
 
 class ResourceSerializer(serializers.ModelSerializer):
@@ -39,8 +40,22 @@ class RoleSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Role
-        fields = ('id', 'name', 'description', 'created_at', 'updated_at')
+        fields = ('id', 'name', 'description', 'parent', 'created_at', 'updated_at')
         read_only_fields = ('id', 'created_at', 'updated_at')
+    
+    def validate_parent(self, parent):
+        """
+        Reject a parent that would create a cycle in the hierarchy.
+        Запрет родителя, который создает цикл в иерархии.
+        """
+        if parent is not None and self.instance is not None and RoleClosure.objects.filter(
+            ancestor_id=self.instance.pk, descendant_id=parent.pk
+        ).exists():
+            raise serializers.ValidationError(
+                'Role cannot inherit from itself or its descendant. / '
+                'Роль не может наследовать от себя или своего потомка.'
+            )
+        return parent
 
 
 class PermissionSerializer(serializers.ModelSerializer):
@@ -83,6 +98,29 @@ class PermissionSerializer(serializers.ModelSerializer):
         )
 
 
+class RolePermissionMaskSerializer(serializers.ModelSerializer):
+    """
+    Serializer for RolePermissionMask, action names are expanded from the mask.
+    Сериализатор для RolePermissionMask, имена действий раскрываются из маски.
+    """
+    role = serializers.SlugRelatedField(slug_field='name', read_only=True)
+    resource = serializers.SlugRelatedField(slug_field='name', read_only=True)
+    action_names = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = RolePermissionMask
+        fields = ('id', 'role', 'resource', 'actions', 'action_names')
+        read_only_fields = fields
+    
+    def get_action_names(self, obj):
+        """
+        Names of actions whose bits are set, context['action_names'] maps bit → name.
+        Имена действий с установленными битами, context['action_names'] — бит → имя.
+        """
+        action_names = self.context['action_names']
+        return sorted(name for bit, name in action_names.items() if has_action(obj.actions, bit))
+
+
 class UserRoleSerializer(serializers.ModelSerializer):
     """
     Serializer for UserRole.
@@ -123,6 +161,20 @@ class UserRoleSerializer(serializers.ModelSerializer):
         return UserRole.objects.create(user=user, role=role)
 
 
+class ObjectPermissionSerializer(serializers.ModelSerializer):
+    """
+    Serializer for ObjectPermission, resource and action are set by name.
+    Сериализатор для ObjectPermission, ресурс и действие задаются по имени.
+    """
+    resource = serializers.SlugRelatedField(slug_field='name', queryset=Resource.objects.all())
+    action = serializers.SlugRelatedField(slug_field='name', queryset=Action.objects.all())
+    
+    class Meta:
+        model = ObjectPermission
+        fields = ('id', 'user', 'resource', 'action', 'object_id', 'created_at')
+        read_only_fields = ('id', 'created_at')
+
+
 class PermissionListSerializer(serializers.Serializer):
     """
     Serializer for listing permissions with filters.
@@ -131,3 +183,40 @@ class PermissionListSerializer(serializers.Serializer):
     role_id = serializers.IntegerField(required=False)
     resource_id = serializers.IntegerField(required=False)
     action_id = serializers.IntegerField(required=False)
+
+
+class PermissionCheckItemSerializer(serializers.Serializer):
+    """
+    Serializer for a single resource/action pair to check.
+    Сериализатор для одной проверяемой пары ресурс/действие.
+    """
+    resource = serializers.CharField(max_length=100)
+    action = serializers.CharField(max_length=50)
+
+
+class PermissionCheckSerializer(serializers.Serializer):
+    """
+    Serializer for bulk permission check.
+    Сериализатор для массовой проверки прав доступа.
+    """
+    user_id = serializers.IntegerField(required=False)
+    checks = PermissionCheckItemSerializer(many=True, allow_empty=False, max_length=500)
+
+
+class UserRoleBulkItemSerializer(serializers.Serializer):
+    """
+    Item of a bulk role assignment request.
+    Элемент массового запроса назначения ролей.
+    """
+    user_id = serializers.IntegerField(min_value=1)
+    role_id = serializers.IntegerField(min_value=1)
+
+
+class PermissionBulkItemSerializer(serializers.Serializer):
+    """
+    Item of a bulk permission rule request.
+    Элемент массового запроса правил доступа.
+    """
+    role_id = serializers.IntegerField(min_value=1)
+    resource_id = serializers.IntegerField(min_value=1)
+    action_id = serializers.IntegerField(min_value=1)
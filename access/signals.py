@@ -0,0 +1,265 @@
+"""
+Signal handlers invalidating access control caches.
+Обработчики сигналов для инвалидации кэшей контроля доступа.
+
+- UserRole change bumps the generation of that user only.
+- Permission change bumps the generation of every user holding the role
+  or a role inheriting from it.
+- Permission change also refreshes the (role, resource) permission mask.
+- Role parent change updates the closure table and bumps users of the moved subtree.
+- Action create gets a bit position.
+- Resource/Action create or rename bumps the global epoch and drops the
+  interned names snapshot (access/registry.py).
+- Role/Resource/Action delete (with its CASCADE) bumps the global epoch.
+
+Inside invalidation_suspended() handlers do nothing; bulk writers (policy
+import) rebuild the closure and masks and bump the epoch once instead.
+
+- Изменение UserRole увеличивает поколение только этого пользователя.
+- Изменение Permission увеличивает поколение всех пользователей с этой ролью
+  или ролью, которая от нее наследует.
+- Изменение Permission также обновляет маску прав (роль, ресурс).
+- Изменение родителя роли обновляет таблицу замыкания и увеличивает поколение
+  пользователей перемещенного поддерева.
+- Создание Action назначает позицию бита.
+- Создание или переименование Resource/Action увеличивает глобальную эпоху
+  и сбрасывает снимок интернированных имен (access/registry.py).
+- Удаление Role/Resource/Action (вместе с CASCADE) увеличивает глобальную эпоху.
+
+Внутри invalidation_suspended() обработчики ничего не делают; массовая запись
+(импорт политики) вместо этого один раз перестраивает замыкание и маски и
+увеличивает эпоху.
+"""
+import threading
+from contextlib import contextmanager
+from functools import partial, wraps
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from .models import Role, Resource, Action, Permission, UserRole
+from .cache import bump_user_generation, bump_users_generation, bump_role_generation, bump_global_epoch
+from .closure import add_role, move_role, detach_role, subtree_role_ids
+from .masks import next_action_bit, refresh_mask, clear_action_bit
+from .registry import invalidate_names
+
+EPOCH_MODELS = (Role, Resource, Action)
+
+_suspended = threading.local()
+
+
+@contextmanager
+def invalidation_suspended():
+    """
+    Skip per-row closure/mask maintenance and cache invalidation in the block.
+    The caller must rebuild the closure and masks and bump the global epoch.
+    Пропуск построчного обслуживания замыкания/масок и инвалидации кэша в блоке.
+    Вызывающий код должен перестроить замыкание и маски и увеличить эпоху.
+    """
+    previous = getattr(_suspended, 'active', False)
+    _suspended.active = True
+    try:
+        yield
+    finally:
+        _suspended.active = previous
+
+
+def _unless_suspended(handler):
+    @wraps(handler)
+    def wrapper(*args, **kwargs):
+        if getattr(_suspended, 'active', False):
+            return
+        return handler(*args, **kwargs)
+    return wrapper
+
+
+def _is_epoch_cascade(origin):
+    """
+    Check if delete was started by a model whose delete bumps the global epoch.
+    Проверка, что удаление начато моделью, удаление которой увеличивает эпоху.
+    """
+    if isinstance(origin, QuerySet):
+        return issubclass(origin.model, EPOCH_MODELS)
+    return isinstance(origin, EPOCH_MODELS)
+
+
+def _on_commit(func, *args):
+    """
+    Run invalidation after commit, so readers never cache pre-commit state
+    under a new generation.
+    Запуск инвалидации после коммита, чтобы читатели не закэшировали
+    состояние до коммита под новым поколением.
+    """
+    transaction.on_commit(partial(func, *args))
+
+
+@receiver(pre_save, sender=UserRole)
+@receiver(pre_save, sender=Permission)
+@_unless_suspended
+def remember_previous_owner(sender, instance, raw=False, **kwargs):
+    """
+    Remember previous user/role (and resource of a rule) of an updated row
+    to invalidate it as well.
+    Запоминание прежнего пользователя/роли (и ресурса правила) обновляемой
+    записи для инвалидации.
+    """
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    if sender is UserRole:
+        instance._access_previous_owner = (
+            sender.objects.filter(pk=instance.pk).values_list('user_id', flat=True).first()
+        )
+        return
+    previous = sender.objects.filter(pk=instance.pk).values_list('role_id', 'resource_id').first()
+    if previous is not None:
+        instance._access_previous_owner = previous[0]
+        instance._access_previous_mask = previous
+
+
+@receiver(pre_save, sender=Action)
+def assign_action_bit(sender, instance, raw=False, **kwargs):
+    """
+    Give a new action the lowest free bit position in permission masks.
+    An existing action keeps its bit even when saved without it (fixtures),
+    masks store bits and would point at another action otherwise. Raw new
+    rows get bits lazily from refresh_mask().
+    Назначение новому действию наименьшей свободной позиции бита в масках прав.
+    Существующее действие сохраняет свой бит даже при сохранении без него
+    (фикстуры), иначе биты в масках указывали бы на другое действие. Новые
+    raw-строки получают биты позже через refresh_mask().
+    """
+    if instance.bit is not None:
+        return
+    if instance.pk is not None:
+        instance.bit = sender.objects.filter(pk=instance.pk).values_list('bit', flat=True).first()
+        if instance.bit is not None:
+            return
+    if raw:
+        return
+    instance.bit = next_action_bit()
+
+
+@receiver(pre_delete, sender=Action)
+@_unless_suspended
+def clear_deleted_action_bit(sender, instance, **kwargs):
+    """
+    Remove a deleted action from permission masks, so its bit can be reused.
+    Удаление действия из масок прав, чтобы его бит можно было использовать снова.
+    """
+    if instance.bit is not None:
+        clear_action_bit(instance.bit)
+
+
+@receiver(pre_save, sender=Role)
+@_unless_suspended
+def remember_previous_parent(sender, instance, **kwargs):
+    """
+    Remember previous parent of a saved role and reject cycles before the row is written.
+    Запоминание прежнего родителя роли и запрет циклов до записи строки.
+    """
+    instance._access_previous_parent = None
+    if instance.pk is None:
+        return
+    instance._access_previous_parent = (
+        sender.objects.filter(pk=instance.pk).values_list('parent_id', flat=True).first()
+    )
+    if instance.parent_id is not None and instance.parent_id != instance._access_previous_parent:
+        if instance.parent_id in subtree_role_ids(instance.pk):
+            raise ValueError('Role cannot inherit from itself or its descendant / '
+                             'Роль не может наследовать от себя или своего потомка')
+
+
+@receiver(post_save, sender=Role)
+@_unless_suspended
+def update_role_closure(sender, instance, created=False, **kwargs):
+    """
+    Maintain the closure table when a role is created or its parent changes.
+    Обслуживание таблицы замыкания при создании роли или смене родителя.
+    """
+    if created:
+        add_role(instance.pk, instance.parent_id)
+        return
+    if getattr(instance, '_access_previous_parent', None) == instance.parent_id:
+        return
+    move_role(instance.pk, instance.parent_id)
+    user_ids = list(
+        UserRole.objects.filter(role_id__in=subtree_role_ids(instance.pk)).values_list('user_id', flat=True)
+    )
+    _on_commit(bump_users_generation, user_ids)
+
+
+@receiver(pre_delete, sender=Role)
+@_unless_suspended
+def detach_deleted_role(sender, instance, **kwargs):
+    """
+    Detach subtree of a deleted role from its ancestors.
+    Отсоединение поддерева удаляемой роли от ее предков.
+    """
+    detach_role(instance.pk)
+
+
+@receiver(post_save, sender=UserRole)
+@receiver(post_delete, sender=UserRole)
+@_unless_suspended
+def invalidate_user_role(sender, instance, origin=None, **kwargs):
+    """
+    Invalidate permissions of the user whose role changed.
+    Инвалидация прав пользователя, чья роль изменилась.
+    """
+    if _is_epoch_cascade(origin):
+        return
+    _on_commit(bump_user_generation, instance.user_id)
+    previous = getattr(instance, '_access_previous_owner', None)
+    if previous is not None and previous != instance.user_id:
+        _on_commit(bump_user_generation, previous)
+
+
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+@_unless_suspended
+def invalidate_permission(sender, instance, origin=None, **kwargs):
+    """
+    Invalidate permissions of every user holding the role of the changed rule
+    or a role inheriting from it.
+    Инвалидация прав всех пользователей с ролью измененного правила
+    или ролью, которая от нее наследует.
+    """
+    if _is_epoch_cascade(origin):
+        return
+    refresh_mask(instance.role_id, instance.resource_id)
+    previous_mask = getattr(instance, '_access_previous_mask', None)
+    if previous_mask is not None and previous_mask != (instance.role_id, instance.resource_id):
+        refresh_mask(*previous_mask)
+    _on_commit(bump_role_generation, instance.role_id)
+    previous = getattr(instance, '_access_previous_owner', None)
+    if previous is not None and previous != instance.role_id:
+        _on_commit(bump_role_generation, previous)
+
+
+@receiver(post_save, sender=Resource)
+@receiver(post_save, sender=Action)
+@_unless_suspended
+def invalidate_renamed(sender, instance, created=False, **kwargs):
+    """
+    Resource and action names are part of compiled sets and of the interned
+    names registry, so create and update bump the epoch and drop the snapshot.
+    Имена ресурсов и действий входят в скомпилированные наборы и в реестр
+    интернированных имен, поэтому создание и обновление увеличивают эпоху
+    и сбрасывают снимок.
+    """
+    _on_commit(bump_global_epoch)
+    _on_commit(invalidate_names)
+
+
+@receiver(post_delete, sender=Role)
+@receiver(post_delete, sender=Resource)
+@receiver(post_delete, sender=Action)
+@_unless_suspended
+def invalidate_deleted(sender, instance, **kwargs):
+    """
+    Bump global epoch on role, resource or action delete.
+    Увеличение глобальной эпохи при удалении роли, ресурса или действия.
+    """
+    _on_commit(bump_global_epoch)
+    if sender is not Role:
+        _on_commit(invalidate_names)
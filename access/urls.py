@@ -14,8 +14,16 @@ router.register(r'resources', views.ResourceViewSet, basename='resource')
 router.register(r'actions', views.ActionViewSet, basename='action')
 router.register(r'permissions', views.PermissionViewSet, basename='permission')
 router.register(r'user-roles', views.UserRoleViewSet, basename='user-role')
+router.register(r'object-permissions', views.ObjectPermissionViewSet, basename='object-permission')
 
 urlpatterns = [
     path('', include(router.urls)),
     path('overview/', views.access_overview, name='overview'),
+    path('policy/', views.policy, name='policy'),
+    path('check/', views.check_permissions, name='check'),
+    path(
+        'users/<int:user_id>/effective-permissions/',
+        views.user_effective_permissions,
+        name='user-effective-permissions'
+    ),
 ]
@@ -2,19 +2,81 @@
 Views for access app (admin API).
 Представления для приложения access (административный API).
 """
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.http import parse_etags
 from rest_framework import status, generics, viewsets
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from .models import Role, Resource, Action, Permission, UserRole
+from core.pagination import KeysetPagination
+from .models import Role, Resource, Action, Permission, RolePermissionMask, UserRole, ObjectPermission
 from .serializers import (
     RoleSerializer,
     ResourceSerializer,
     ActionSerializer,
     PermissionSerializer,
-    UserRoleSerializer
+    RolePermissionMaskSerializer,
+    UserRoleSerializer,
+    ObjectPermissionSerializer,
+    PermissionCheckSerializer,
+    UserRoleBulkItemSerializer,
+    PermissionBulkItemSerializer
 )
-from .permissions import check_user_permission
+from .bulk import (
+    bulk_create_user_roles,
+    bulk_delete_user_roles,
+    bulk_create_permissions,
+    bulk_delete_permissions,
+    get_bulk_max_items
+)
+from .cache import get_global_epoch, get_permission_etag, get_user_permissions
+from .permissions import check_user_permission, check_user_permissions
+from .policy import PolicyError, apply_policy, export_policy
+from .registry import get_names
+from users.models import User
+
+
+def effective_permissions_response(request, user):
+    """
+    Build resource -> actions map of the user with ETag revalidation support.
+    Returns 304 when If-None-Match matches the user's permission version.
+    Построение словаря ресурс -> действия пользователя с поддержкой ETag.
+    Возвращает 304, если If-None-Match совпадает с версией прав пользователя.
+    """
+    etag = get_permission_etag(user.pk)
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Authorization'}
+    if_none_match = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+    if etag in if_none_match or '*' in if_none_match:
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    permissions = {}
+    for resource_name, action_name in sorted(get_user_permissions(user)):
+        permissions.setdefault(resource_name, []).append(action_name)
+    return Response({
+        'user_id': user.pk,
+        'permissions': permissions
+    }, status=status.HTTP_200_OK, headers=headers)
+
+
+def bulk_response(request, item_serializer_class, apply):
+    """
+    Validate a list of items, apply it in bulk and return per-item results
+    with totals by status.
+    Проверка списка элементов, массовое применение и ответ с результатами
+    по элементам и итогами по статусам.
+    """
+    serializer = item_serializer_class(
+        data=request.data, many=True, allow_empty=False, max_length=get_bulk_max_items()
+    )
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    results = apply(serializer.validated_data)
+    totals = {}
+    for result in results:
+        totals[result['status']] = totals.get(result['status'], 0) + 1
+    return Response({'totals': totals, 'results': results}, status=status.HTTP_200_OK)
 
 
 class IsAdminPermission(IsAuthenticated):
@@ -71,6 +133,16 @@ class PermissionViewSet(viewsets.ModelViewSet):
     queryset = Permission.objects.select_related('role', 'resource', 'action').all()
     serializer_class = PermissionSerializer
     permission_classes = [IsAdminPermission]
+    pagination_class = KeysetPagination
+    
+    def get_keyset_fields(self):
+        """
+        Unique keys to paginate by, backed by the unique_together indexes.
+        Уникальные ключи пагинации, покрытые индексами unique_together.
+        """
+        if self.action == 'masks':
+            return ('role_id', 'resource_id')
+        return ('role_id', 'resource_id', 'action_id')
     
     def get_queryset(self):
         """
@@ -90,6 +162,45 @@ class PermissionViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(action_id=action_id)
         
         return queryset
+    
+    @action(detail=False, methods=['get'])
+    def masks(self, request):
+        """
+        Compact form of the rules: one action bitmask per (role, resource),
+        filtered by role_id and resource_id.
+        Компактная форма правил: одна битовая маска действий на (роль, ресурс),
+        с фильтрацией по role_id и resource_id.
+        """
+        queryset = RolePermissionMask.objects.select_related('role', 'resource')
+        role_id = request.query_params.get('role_id')
+        resource_id = request.query_params.get('resource_id')
+        if role_id:
+            queryset = queryset.filter(role_id=role_id)
+        if resource_id:
+            queryset = queryset.filter(resource_id=resource_id)
+        
+        context = {**self.get_serializer_context(), 'action_names': get_names(get_global_epoch()).action_bits}
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = RolePermissionMaskSerializer(page, many=True, context=context)
+            return self.get_paginated_response(serializer.data)
+        return Response(RolePermissionMaskSerializer(queryset, many=True, context=context).data)
+    
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Create many rules: [{"role_id": 1, "resource_id": 1, "action_id": 1}, ...].
+        Создание многих правил: [{"role_id": 1, "resource_id": 1, "action_id": 1}, ...].
+        """
+        return bulk_response(request, PermissionBulkItemSerializer, bulk_create_permissions)
+    
+    @action(detail=False, methods=['post'], url_path='bulk-delete')
+    def bulk_delete(self, request):
+        """
+        Delete many rules given as in bulk create.
+        Удаление многих правил в том же формате, что и при массовом создании.
+        """
+        return bulk_response(request, PermissionBulkItemSerializer, bulk_delete_permissions)
 
 
 class UserRoleViewSet(viewsets.ModelViewSet):
@@ -100,6 +211,8 @@ class UserRoleViewSet(viewsets.ModelViewSet):
     queryset = UserRole.objects.select_related('user', 'role').all()
     serializer_class = UserRoleSerializer
     permission_classes = [IsAdminPermission]
+    pagination_class = KeysetPagination
+    keyset_fields = ('user_id', 'role_id')
     
     def get_queryset(self):
         """
@@ -116,6 +229,51 @@ class UserRoleViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(role_id=role_id)
         
         return queryset
+    
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Assign many roles: [{"user_id": 1, "role_id": 2}, ...].
+        Назначение многих ролей: [{"user_id": 1, "role_id": 2}, ...].
+        """
+        return bulk_response(request, UserRoleBulkItemSerializer, bulk_create_user_roles)
+    
+    @action(detail=False, methods=['post'], url_path='bulk-delete')
+    def bulk_delete(self, request):
+        """
+        Remove many role assignments given as in bulk assign.
+        Снятие многих назначений ролей в том же формате, что и при массовом назначении.
+        """
+        return bulk_response(request, UserRoleBulkItemSerializer, bulk_delete_user_roles)
+
+
+class ObjectPermissionViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for managing object-level permissions (admin only).
+    ViewSet для управления правами на объекты (только для админов).
+    """
+    queryset = ObjectPermission.objects.select_related('resource', 'action').all()
+    serializer_class = ObjectPermissionSerializer
+    permission_classes = [IsAdminPermission]
+    
+    def get_queryset(self):
+        """
+        Filter object permissions by user, resource or object.
+        Фильтрация прав на объекты по пользователю, ресурсу или объекту.
+        """
+        queryset = super().get_queryset()
+        user_id = self.request.query_params.get('user_id')
+        resource = self.request.query_params.get('resource')
+        object_id = self.request.query_params.get('object_id')
+        
+        if user_id:
+            queryset = queryset.filter(user_id=user_id)
+        if resource:
+            queryset = queryset.filter(resource__name=resource)
+        if object_id:
+            queryset = queryset.filter(object_id=object_id)
+        
+        return queryset
 
 
 @api_view(['GET'])
@@ -138,3 +296,71 @@ def access_overview(request):
         'permissions': permissions_count,
         'user_roles': user_roles_count
     }, status=status.HTTP_200_OK)
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAdminPermission])
+def policy(request):
+    """
+    GET streams the whole policy as one JSON document; POST applies a document
+    as a diff in one transaction (?dry_run=true only reports the changes).
+    GET отдает всю политику потоком одним JSON-документом; POST применяет
+    документ как разницу в одной транзакции (?dry_run=true только сообщает изменения).
+    """
+    if request.method == 'GET':
+        response = StreamingHttpResponse(export_policy(), content_type='application/json')
+        response['Content-Disposition'] = 'attachment; filename="policy.json"'
+        return response
+    
+    dry_run = request.query_params.get('dry_run', '').lower() in ('1', 'true', 'yes')
+    try:
+        summary = apply_policy(request.data, dry_run=dry_run)
+    except PolicyError as e:
+        return Response({'errors': e.errors}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'dry_run': dry_run, 'changes': summary}, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminPermission])
+def user_effective_permissions(request, user_id):
+    """
+    Get effective permissions of a user (resource -> actions).
+    Получение действующих прав пользователя (ресурс -> действия).
+    """
+    user = get_object_or_404(User, id=user_id)
+    return effective_permissions_response(request, user)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def check_permissions(request):
+    """
+    Check a batch of resource/action pairs for a user in one call.
+    Checking other users requires admin role.
+    Проверка набора пар ресурс/действие для пользователя за один вызов.
+    Проверка других пользователей требует роли admin.
+    """
+    serializer = PermissionCheckSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    user = request.user
+    user_id = serializer.validated_data.get('user_id')
+    if user_id is not None and user_id != user.id:
+        if not check_user_permission(request.user, 'access', 'admin'):
+            return Response({
+                'detail': 'You do not have permission to perform this action.'
+            }, status=status.HTTP_403_FORBIDDEN)
+        user = User.objects.filter(id=user_id).first()
+        if user is None:
+            return Response({'detail': 'User not found. / Пользователь не найден.'}, status=status.HTTP_404_NOT_FOUND)
+    
+    pairs = [(item['resource'], item['action']) for item in serializer.validated_data['checks']]
+    results = check_user_permissions(user, pairs)
+    return Response({
+        'user_id': user.id,
+        'results': [
+            {'resource': resource_name, 'action': action_name, 'allowed': results[(resource_name, action_name)]}
+            for resource_name, action_name in pairs
+        ]
+    }, status=status.HTTP_200_OK)
@@ -0,0 +1,14 @@
+"""
+App configuration for benchmarks app.
+Конфигурация приложения benchmarks.
+"""
+from django.apps import AppConfig
+
+
+class BenchmarksConfig(AppConfig):
+    """
+    Benchmarks app config, provides the bench management command.
+    Конфигурация приложения benchmarks, предоставляет команду bench.
+    """
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'benchmarks'
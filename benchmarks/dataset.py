@@ -0,0 +1,89 @@
+"""
+Synthetic dataset for benchmarks.
+Синтетический набор данных для бенчмарков.
+"""
+import random
+from dataclasses import dataclass, field
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from access.closure import rebuild_closure
+from access.masks import rebuild_masks
+from access.models import Role, Resource, Action, Permission, UserRole
+from users.models import User, SessionToken
+from users.sessions import generate_key, hash_key
+
+PASSWORD = 'bench-password-123'
+ADMIN_EMAIL = 'bench-admin@example.com'
+
+
+@dataclass
+class Dataset:
+    """
+    Seeded users with their tokens.
+    Созданные пользователи и их токены.
+    """
+    emails: list = field(default_factory=list)
+    tokens: list = field(default_factory=list)
+    admin_token: str = ''
+    password: str = PASSWORD
+
+
+def seed_dataset(users=1000, roles=20, resources=20, actions=5, roles_per_user=3,
+                 permissions_per_role=30, seed=0):
+    """
+    Load initial fixtures and create bench roles, resources, actions, permissions
+    and users. Every bench user has the "user" role plus random bench roles.
+    Загрузка начальных фикстур и создание ролей, ресурсов, действий, прав
+    и пользователей. У каждого пользователя есть роль "user" и случайные роли.
+    """
+    rng = random.Random(seed)
+    call_command('loaddata', 'initial_data', verbosity=0)
+    
+    Role.objects.bulk_create([Role(name=f'bench-role-{i}') for i in range(roles)])
+    # bulk_create skips signals maintaining the closure / bulk_create пропускает сигналы замыкания
+    rebuild_closure()
+    Resource.objects.bulk_create([Resource(name=f'bench-resource-{i}') for i in range(resources)])
+    Action.objects.bulk_create([Action(name=f'bench-action-{i}') for i in range(actions)])
+    role_ids = list(Role.objects.filter(name__startswith='bench-').values_list('id', flat=True))
+    resource_ids = list(Resource.objects.filter(name__startswith='bench-').values_list('id', flat=True))
+    action_ids = list(Action.objects.filter(name__startswith='bench-').values_list('id', flat=True))
+    
+    pairs = [(resource_id, action_id) for resource_id in resource_ids for action_id in action_ids]
+    Permission.objects.bulk_create([
+        Permission(role_id=role_id, resource_id=resource_id, action_id=action_id)
+        for role_id in role_ids
+        for resource_id, action_id in rng.sample(pairs, min(permissions_per_role, len(pairs)))
+    ])
+    # Same for action bits and permission masks / То же для битов действий и масок прав
+    rebuild_masks()
+    
+    # Hash once: every bench user shares the password / Хеширование один раз: пароль общий
+    password = make_password(PASSWORD)
+    User.objects.bulk_create([
+        User(email=f'bench-user-{i}@example.com', full_name=f'Bench User {i}', password=password)
+        for i in range(users)
+    ] + [User(email=ADMIN_EMAIL, full_name='Bench Admin', password=password)])
+    user_ids = dict(User.objects.filter(email__startswith='bench-').values_list('email', 'id'))
+    
+    default_roles = dict(Role.objects.filter(name__in=['admin', 'user']).values_list('name', 'id'))
+    user_roles = [UserRole(user_id=user_ids[ADMIN_EMAIL], role_id=default_roles['admin'])]
+    for i in range(users):
+        user_id = user_ids[f'bench-user-{i}@example.com']
+        user_roles.append(UserRole(user_id=user_id, role_id=default_roles['user']))
+        user_roles.extend(
+            UserRole(user_id=user_id, role_id=role_id)
+            for role_id in rng.sample(role_ids, min(roles_per_user, len(role_ids)))
+        )
+    UserRole.objects.bulk_create(user_roles)
+    
+    tokens = {user_id: generate_key() for user_id in user_ids.values()}
+    SessionToken.objects.bulk_create([
+        SessionToken(key_hash=hash_key(key), user_id=user_id, device='bench') for user_id, key in tokens.items()
+    ])
+    
+    dataset = Dataset(admin_token=tokens[user_ids[ADMIN_EMAIL]])
+    for i in range(users):
+        email = f'bench-user-{i}@example.com'
+        dataset.emails.append(email)
+        dataset.tokens.append(tokens[user_ids[email]])
+    return dataset
@@ -0,0 +1,126 @@
+"""
+Seed a synthetic dataset in a test database and benchmark API endpoints.
+Заполнение тестовой БД синтетическими данными и бенчмарк API endpoints.
+"""
+import json
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from benchmarks.dataset import seed_dataset
+from benchmarks.scenarios import SCENARIOS, run_scenario
+
+COLUMNS = ('p50', 'p95', 'p99', 'rps', 'queries')
+
+
+class Command(BaseCommand):
+    """
+    Run scenarios in-process against a throwaway test database and report
+    p50/p95/p99 latency, requests per second and SQL queries per request.
+    Запуск сценариев внутри процесса на временной тестовой БД с отчетом
+    о задержке p50/p95/p99, запросах в секунду и SQL-запросах на запрос.
+    """
+    help = 'Benchmark auth and access endpoints / Бенчмарк endpoints аутентификации и доступа'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('scenarios', nargs='*', help=f'Scenarios to run (default: all): {", ".join(SCENARIOS)}')
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--roles', type=int, default=20)
+        parser.add_argument('--resources', type=int, default=20)
+        parser.add_argument('--actions', type=int, default=5)
+        parser.add_argument('--roles-per-user', type=int, default=3)
+        parser.add_argument('--permissions-per-role', type=int, default=30)
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per scenario')
+        parser.add_argument('--warmup', type=int, default=20, help='Unmeasured requests per scenario')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Save results as JSON')
+        parser.add_argument('--compare', help='JSON results of a previous run to compare with')
+    
+    def handle(self, *args, **options):
+        if options['users'] < 1:
+            raise CommandError('At least one user is required / Требуется хотя бы один пользователь')
+        if options['requests'] < 1:
+            raise CommandError('At least one measured request is required / Требуется хотя бы один измеряемый запрос')
+        baseline = self.load_baseline(options['compare'])
+        names = options['scenarios'] or list(SCENARIOS)
+        unknown = set(names) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f'Unknown scenarios / Неизвестные сценарии: {", ".join(sorted(unknown))}')
+        
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(**self.isolated_settings()):
+                dataset = seed_dataset(
+                    users=options['users'],
+                    roles=options['roles'],
+                    resources=options['resources'],
+                    actions=options['actions'],
+                    roles_per_user=options['roles_per_user'],
+                    permissions_per_role=options['permissions_per_role'],
+                    seed=options['seed'],
+                )
+                self.stdout.write(
+                    f'Dataset: {options["users"]} users, {options["roles"]} roles, '
+                    f'{options["resources"]} resources, {options["actions"]} actions'
+                )
+                results = [
+                    run_scenario(name, dataset, requests=options['requests'], warmup=options['warmup'])
+                    for name in names
+                ]
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+        
+        self.report(results, baseline)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump({result.name: result.as_dict() for result in results}, f, indent=2)
+            self.stdout.write(f'Results saved to {options["output"]}')
+    
+    def isolated_settings(self):
+        """
+        Prefix cache keys so bench data never mixes with a shared production cache,
+        and disable login rate limits that would throttle the login scenario.
+        Префикс ключей кэша, чтобы данные бенчмарка не смешивались с общим кэшем,
+        и отключение лимитов входа, которые ограничили бы сценарий login.
+        """
+        caches = {
+            alias: {**config, 'KEY_PREFIX': f'bench:{config.get("KEY_PREFIX", "")}'}
+            for alias, config in settings.CACHES.items()
+        }
+        return {'CACHES': caches, 'LOGIN_RATE_LIMIT_IP': None, 'LOGIN_RATE_LIMIT_EMAIL': None}
+    
+    def load_baseline(self, path):
+        if not path:
+            return {}
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Cannot read baseline {path}: {e}')
+    
+    def report(self, results, baseline):
+        """
+        Print results table, with change against the baseline when given.
+        Вывод таблицы результатов с изменением относительно базового запуска.
+        """
+        self.stdout.write(
+            f'{"scenario":<20} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"req/s":>9} {"queries":>8} {"errors":>7}'
+        )
+        for result in results:
+            self.stdout.write(
+                f'{result.name:<20} {result.p50:9.2f} {result.p95:9.2f} {result.p99:9.2f} '
+                f'{result.rps:9.1f} {result.queries:8.1f} {result.errors:7d}'
+            )
+            previous = baseline.get(result.name)
+            if previous:
+                changes = ' '.join(
+                    f'{column} {self.change(previous[column], getattr(result, column))}' for column in COLUMNS
+                )
+                self.stdout.write(f'{"  vs baseline":<20} {changes}')
+    
+    def change(self, old, new):
+        if not old:
+            return 'n/a'
+        return f'{(new - old) / old * 100:+.1f}%'
@@ -0,0 +1,116 @@
+"""
+Benchmark scenarios and in-process runner.
+Сценарии бенчмарков и запуск внутри процесса.
+
+Each scenario builds a request for the i-th iteration: (method, url, data, token).
+Requests go through the full Django stack with the test client, so middleware,
+authentication, permissions and serializers are all measured.
+Каждый сценарий строит запрос для i-й итерации: (method, url, data, token).
+Запросы проходят через весь стек Django тестовым клиентом, поэтому
+измеряются middleware, аутентификация, права и сериализаторы.
+"""
+import statistics
+import time
+from collections import Counter
+from dataclasses import dataclass
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+def login(dataset, i):
+    email = dataset.emails[i % len(dataset.emails)]
+    return 'post', reverse('users:login'), {'email': email, 'password': dataset.password}, None
+
+
+def profile(dataset, i):
+    return 'get', reverse('users:profile'), None, dataset.tokens[i % len(dataset.tokens)]
+
+
+def mock_projects(dataset, i):
+    return 'get', reverse('mock:mock-projects'), None, dataset.tokens[i % len(dataset.tokens)]
+
+
+def access_roles(dataset, i):
+    return 'get', reverse('access:role-list'), None, dataset.admin_token
+
+
+def access_permissions(dataset, i):
+    return 'get', reverse('access:permission-list'), None, dataset.admin_token
+
+
+def access_user_roles(dataset, i):
+    return 'get', reverse('access:user-role-list'), None, dataset.admin_token
+
+
+SCENARIOS = {
+    'login': login,
+    'profile': profile,
+    'mock_projects': mock_projects,
+    'access_roles': access_roles,
+    'access_permissions': access_permissions,
+    'access_user_roles': access_user_roles,
+}
+
+
+@dataclass
+class Result:
+    """
+    Measurements of one scenario.
+    Результаты измерений одного сценария.
+    """
+    name: str
+    requests: int
+    p50: float
+    p95: float
+    p99: float
+    rps: float
+    queries: float
+    errors: int
+    
+    def as_dict(self):
+        return dict(self.__dict__)
+
+
+def send(client, request):
+    method, url, data, token = request
+    headers = {'HTTP_AUTHORIZATION': f'Token {token}'} if token else {}
+    if method == 'get':
+        return client.get(url, **headers)
+    return getattr(client, method)(url, data, content_type='application/json', **headers)
+
+
+def run_scenario(name, dataset, requests=200, warmup=20):
+    """
+    Run scenario sequentially and collect latency (ms), throughput and queries per request.
+    Последовательный запуск сценария и сбор задержки (мс), пропускной способности и запросов к БД.
+    """
+    build = SCENARIOS[name]
+    client = Client()
+    for i in range(warmup):
+        send(client, build(dataset, i))
+    
+    timings, queries, statuses = [], [], Counter()
+    started = time.perf_counter()
+    for i in range(requests):
+        request = build(dataset, warmup + i)
+        with CaptureQueriesContext(connection) as captured:
+            request_started = time.perf_counter()
+            response = send(client, request)
+            timings.append((time.perf_counter() - request_started) * 1000)
+        queries.append(len(captured))
+        statuses[response.status_code] += 1
+    total = time.perf_counter() - started
+    
+    percentiles = statistics.quantiles(timings, n=100, method='inclusive') if len(timings) > 1 else timings * 99
+    return Result(
+        name=name,
+        requests=requests,
+        p50=percentiles[49],
+        p95=percentiles[94],
+        p99=percentiles[98],
+        rps=requests / total if total else 0.0,
+        queries=statistics.mean(queries),
+        errors=sum(count for code, count in statuses.items() if code >= 400),
+    )
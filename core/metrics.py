@@ -0,0 +1,277 @@
+"""
+Prometheus-style metrics for authentication and authorization.
+Метрики в стиле Prometheus для аутентификации и авторизации.
+
+Every thread records into its own shard, so the hot path takes no locks;
+shards are summed only when metrics are collected. With METRICS_DIR set,
+each process also writes its totals to METRICS_DIR/<pid>.json (at most every
+METRICS_FLUSH_INTERVAL seconds), and the endpoint merges all files, so any
+gunicorn worker can answer for all of them.
+Каждый поток пишет в свой шард, поэтому горячий путь не берет блокировок;
+шарды суммируются только при сборе метрик. Если задан METRICS_DIR, каждый
+процесс также записывает свои итоги в METRICS_DIR/<pid>.json (не чаще раза
+в METRICS_FLUSH_INTERVAL секунд), а endpoint объединяет все файлы, поэтому
+любой воркер gunicorn отвечает за всех.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from django.conf import settings
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Metric:
+    """
+    Base metric with labels and per-thread shards.
+    Базовая метрика с метками и шардами по потокам.
+    """
+    type = None
+    
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+    
+    def _shard(self):
+        shard = getattr(self._local, 'values', None)
+        if shard is None:
+            shard = self._local.values = {}
+            # Only the first record of a thread takes the lock.
+            # Блокировка берется только при первой записи потока.
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+    
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+    
+    def collect(self):
+        """
+        Sum shards, returns {label values: value}.
+        Суммирование шардов, возвращает {значения меток: значение}.
+        """
+        with self._shards_lock:
+            shards = list(self._shards)
+        totals = {}
+        for shard in shards:
+            for key, value in list(shard.items()):
+                totals[key] = self.merge(totals.get(key), value)
+        return totals
+
+
+class Counter(Metric):
+    """
+    Monotonic counter.
+    Монотонный счетчик.
+    """
+    type = 'counter'
+    
+    def inc(self, amount=1, **labels):
+        shard = self._shard()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0) + amount
+        self.registry.maybe_flush()
+    
+    def merge(self, total, value):
+        return (total or 0) + value
+    
+    def samples(self, key, value):
+        yield self.name, self.labelnames, key, value
+
+
+class Histogram(Metric):
+    """
+    Histogram of observed values (seconds) with cumulative buckets on output.
+    Гистограмма наблюдаемых значений (секунды) с накопительными корзинами при выводе.
+    """
+    type = 'histogram'
+    
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+    
+    def observe(self, value, **labels):
+        shard = self._shard()
+        key = self._key(labels)
+        # Per bucket counts (last one is +Inf), then sum / Счетчики корзин (последняя +Inf), затем сумма
+        data = shard.get(key)
+        if data is None:
+            data = shard[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        data[index] += 1
+        data[-1] += value
+        self.registry.maybe_flush()
+    
+    @contextmanager
+    def time(self, **labels):
+        """
+        Observe duration of the block.
+        Наблюдение длительности блока.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+    
+    def merge(self, total, value):
+        if total is None:
+            return list(value)
+        return [a + b for a, b in zip(total, value)]
+    
+    def samples(self, key, value):
+        cumulative = 0
+        bounds = [format_value(bound) for bound in self.buckets] + ['+Inf']
+        for bound, count in zip(bounds, value[:-1]):
+            cumulative += count
+            yield f'{self.name}_bucket', self.labelnames + ('le',), key + (bound,), cumulative
+        yield f'{self.name}_sum', self.labelnames, key, value[-1]
+        yield f'{self.name}_count', self.labelnames, key, cumulative
+
+
+class Registry:
+    """
+    Metrics registry with optional multi-process aggregation through METRICS_DIR.
+    Реестр метрик с опциональным объединением процессов через METRICS_DIR.
+    """
+    
+    def __init__(self):
+        self.metrics = {}
+        self._last_flush = 0.0
+        self._flush_lock = threading.Lock()
+    
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(self, name, documentation, labelnames))
+    
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(self, name, documentation, labelnames, buckets))
+    
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+    
+    def snapshot(self):
+        """
+        Totals of this process, JSON serializable.
+        Итоги этого процесса, сериализуемые в JSON.
+        """
+        return {
+            name: [[list(key), value] for key, value in metric.collect().items()]
+            for name, metric in self.metrics.items()
+        }
+    
+    def maybe_flush(self):
+        """
+        Write process totals to METRICS_DIR when the flush interval passed.
+        Запись итогов процесса в METRICS_DIR, если прошел интервал записи.
+        """
+        if not getattr(settings, 'METRICS_DIR', ''):
+            return
+        now = time.monotonic()
+        if now - self._last_flush < getattr(settings, 'METRICS_FLUSH_INTERVAL', 5):
+            return
+        if self._flush_lock.acquire(blocking=False):
+            try:
+                self._last_flush = now
+                self.flush()
+            finally:
+                self._flush_lock.release()
+    
+    def flush(self):
+        directory = getattr(settings, 'METRICS_DIR', '')
+        if not directory:
+            return
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'{os.getpid()}.json')
+        with open(f'{path}.tmp', 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(f'{path}.tmp', path)
+    
+    def collect(self):
+        """
+        Totals of all processes (METRICS_DIR) or of this process.
+        Итоги всех процессов (METRICS_DIR) или этого процесса.
+        """
+        directory = getattr(settings, 'METRICS_DIR', '')
+        if not directory:
+            return {name: metric.collect() for name, metric in self.metrics.items()}
+        
+        with self._flush_lock:
+            self.flush()
+        totals = {name: {} for name in self.metrics}
+        for filename in os.listdir(directory):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(directory, filename)) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for name, values in snapshot.items():
+                metric = self.metrics.get(name)
+                if metric is None:
+                    continue
+                for key, value in values:
+                    key = tuple(key)
+                    totals[name][key] = metric.merge(totals[name].get(key), value)
+        return totals
+    
+    def render(self):
+        """
+        Render metrics in Prometheus text exposition format.
+        Вывод метрик в текстовом формате Prometheus.
+        """
+        lines = []
+        for name, values in self.collect().items():
+            metric = self.metrics[name]
+            lines.append(f'# HELP {name} {metric.documentation}')
+            lines.append(f'# TYPE {name} {metric.type}')
+            for key, value in sorted(values.items()):
+                for sample, labelnames, labelvalues, sample_value in metric.samples(key, value):
+                    labels = ','.join(
+                        f'{label}="{escape(label_value)}"' for label, label_value in zip(labelnames, labelvalues)
+                    )
+                    lines.append(f'{sample}{{{labels}}} {format_value(sample_value)}' if labels
+                                 else f'{sample} {format_value(sample_value)}')
+        return '\n'.join(lines) + '\n'
+
+
+def escape(value):
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+registry = Registry()
+atexit.register(registry.flush)
+
+LOGIN_ATTEMPTS = registry.counter(
+    'auth_login_attempts_total', 'Login attempts by result.', ['result']
+)
+PASSWORD_HASH_SECONDS = registry.histogram(
+    'auth_password_hash_seconds', 'Password hashing duration.', ['algorithm', 'operation'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+TOKEN_CACHE_LOOKUPS = registry.counter(
+    'auth_token_cache_lookups_total', 'Token authentication cache lookups by result.', ['result']
+)
+PERMISSION_CHECK_SECONDS = registry.histogram(
+    'access_permission_check_seconds', 'Permission check latency.', ['resource', 'action']
+)
+PERMISSION_DECISIONS = registry.counter(
+    'access_permission_decisions_total', 'Permission check decisions.', ['resource', 'action', 'decision']
+)
@@ -0,0 +1,157 @@
+"""
+Per-request SQL query instrumentation and budgets.
+Учет SQL-запросов на запрос и бюджеты запросов.
+
+Queries are counted with database execute wrappers, so it works with DEBUG=False.
+Budgets are set per URL name in settings.QUERY_BUDGETS, e.g.
+{'access:permission-list': 3}; a request over its budget is logged or,
+with QUERY_BUDGET_ACTION='raise', fails with QueryBudgetExceeded.
+Запросы считаются через execute wrapper БД, поэтому учет работает при DEBUG=False.
+Бюджеты задаются по имени URL в settings.QUERY_BUDGETS, например
+{'access:permission-list': 3}; превышение бюджета логируется или, при
+QUERY_BUDGET_ACTION='raise', завершается исключением QueryBudgetExceeded.
+"""
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Raised when a request or a block runs more queries than its budget.
+    Исключение, когда запрос или блок выполняет больше запросов, чем позволяет бюджет.
+    """
+
+
+class QueryCounter:
+    """
+    Counts queries and their total time (ms) on all database connections.
+    Подсчет запросов и их общего времени (мс) на всех подключениях к БД.
+    """
+    
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self._stack = None
+    
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += (time.perf_counter() - started) * 1000
+    
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+    
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+
+def get_query_budget(url_name):
+    """
+    Query budget for the URL name, falls back to QUERY_BUDGET_DEFAULT.
+    Бюджет запросов для имени URL, по умолчанию QUERY_BUDGET_DEFAULT.
+    """
+    budgets = getattr(settings, 'QUERY_BUDGETS', {})
+    return budgets.get(url_name, getattr(settings, 'QUERY_BUDGET_DEFAULT', None))
+
+
+@contextmanager
+def query_budget(max_queries=None, url_name=None):
+    """
+    Test helper: fail with QueryBudgetExceeded when the block runs more queries
+    than max_queries (or the budget configured for url_name).
+    Хелпер для тестов: QueryBudgetExceeded, если блок выполняет больше запросов,
+    чем max_queries (или бюджет, настроенный для url_name).
+    
+    Example / Пример:
+        with query_budget(url_name='access:permission-list'):
+            client.get(reverse('access:permission-list'), **headers)
+    """
+    if max_queries is None:
+        max_queries = get_query_budget(url_name)
+    with QueryCounter() as counter:
+        yield counter
+    if max_queries is not None and counter.count > max_queries:
+        raise QueryBudgetExceeded(
+            f'{url_name or "block"} ran {counter.count} queries, budget is {max_queries} / '
+            f'{url_name or "блок"} выполнил {counter.count} запросов, бюджет {max_queries}'
+        )
+
+
+class QueryBudgetMiddleware:
+    """
+    Count queries and DB time per request, add a Server-Timing header and
+    enforce the query budget of the resolved URL name.
+    Подсчет запросов и времени БД на запрос, заголовок Server-Timing и
+    проверка бюджета запросов по имени URL.
+    """
+    
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with QueryCounter() as counter:
+            response = self.get_response(request)
+        return self.finish(request, response, counter, started)
+    
+    async def __acall__(self, request):
+        """
+        Async branch: the async ORM runs queries in the request's
+        thread-sensitive sync thread, so the wrappers are installed and
+        removed there.
+        Асинхронная ветка: async ORM выполняет запросы в thread-sensitive
+        потоке запроса, поэтому обертки устанавливаются и снимаются там.
+        """
+        started = time.perf_counter()
+        counter = QueryCounter()
+        await sync_to_async(counter.__enter__)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(counter.__exit__)(None, None, None)
+        return self.finish(request, response, counter, started)
+    
+    def finish(self, request, response, counter, started):
+        """
+        Add Server-Timing and enforce the budget.
+        Заголовок Server-Timing и проверка бюджета.
+        """
+        total = (time.perf_counter() - started) * 1000
+        
+        if getattr(settings, 'SERVER_TIMING_HEADER', False):
+            response['Server-Timing'] = (
+                f'db;dur={counter.duration:.2f};desc="{counter.count} queries", total;dur={total:.2f}'
+            )
+        
+        match = getattr(request, 'resolver_match', None)
+        url_name = match.view_name if match else None
+        budget = get_query_budget(url_name) if url_name else None
+        if budget is not None and counter.count > budget:
+            message = (
+                f'{url_name} ran {counter.count} queries ({counter.duration:.1f} ms), budget is {budget} / '
+                f'{url_name} выполнил {counter.count} запросов ({counter.duration:.1f} мс), бюджет {budget}'
+            )
+            if getattr(settings, 'QUERY_BUDGET_ACTION', 'log') == 'raise':
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
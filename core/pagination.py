@@ -0,0 +1,190 @@
+"""
+Keyset (cursor) pagination over composite ordering keys.
+Keyset-пагинация (по курсору) по составным ключам сортировки.
+
+A page is selected with WHERE (a, b) > (last a, last b) ORDER BY a, b LIMIT n
+instead of OFFSET, so with an index on (a, b) every page costs the same.
+The view sets keyset_fields (a unique combination of columns), e.g.
+('user_id', 'role_id'). Counts can be exact, estimated from the query plan
+(PostgreSQL) or skipped: ?count=exact|estimate|none.
+Страница выбирается через WHERE (a, b) > (последнее a, последнее b)
+ORDER BY a, b LIMIT n вместо OFFSET, поэтому при индексе на (a, b) любая
+страница стоит одинаково. Представление задает keyset_fields (уникальное
+сочетание колонок), например ('user_id', 'role_id'). Количество может быть
+точным, оценкой по плану запроса (PostgreSQL) или не считаться:
+?count=exact|estimate|none.
+"""
+import base64
+import binascii
+import json
+from django.conf import settings
+from django.db import connections
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+COUNT_MODES = ('exact', 'estimate', 'none')
+
+
+def keyset_filter(fields, values, reverse=False):
+    """
+    Row comparison (fields) > (values), or < when reverse, written so the
+    leading column bounds an index range scan.
+    Сравнение строк (fields) > (values), или < при reverse, записанное так,
+    чтобы первая колонка ограничивала диапазон сканирования индекса.
+    """
+    op = 'lt' if reverse else 'gt'
+    after = Q()
+    for i in range(len(fields)):
+        equal = {field: value for field, value in zip(fields[:i], values[:i])}
+        after |= Q(**equal, **{f'{fields[i]}__{op}': values[i]})
+    return Q(**{f'{fields[0]}__{op}e': values[0]}) & after
+
+
+def estimate_count(queryset):
+    """
+    Row estimate from the PostgreSQL planner, None on other backends.
+    Оценка числа строк планировщиком PostgreSQL, None на других бэкендах.
+    """
+    if connections[queryset.db].vendor != 'postgresql':
+        return None
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination by the view's keyset_fields (or get_keyset_fields()).
+    Пагинация по курсору по keyset_fields представления (или get_keyset_fields()).
+    """
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    
+    def get_keyset_fields(self, view):
+        if hasattr(view, 'get_keyset_fields'):
+            return tuple(view.get_keyset_fields())
+        return tuple(getattr(view, 'keyset_fields', ('pk',)))
+    
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+    
+    def encode_cursor(self, values, reverse):
+        data = json.dumps({'v': values, 'r': int(reverse)}, separators=(',', ':'), default=str)
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+    
+    def decode_cursor(self, request, model):
+        """
+        Decode the cursor, every value converted by its model field.
+        Декодирование курсора, каждое значение преобразуется полем модели.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)))
+            values, reverse = data['v'], bool(data['r'])
+            if not isinstance(values, list) or len(values) != len(self.fields):
+                raise ValueError(values)
+            values = [self.to_python(model, field, value) for field, value in zip(self.fields, values)]
+        except (TypeError, ValueError, KeyError, binascii.Error, ValidationError):
+            raise NotFound('Invalid cursor. / Некорректный курсор.')
+        return values, reverse
+    
+    def to_python(self, model, field, value):
+        if value is None or isinstance(value, (list, dict)):
+            raise ValueError(value)
+        name = model._meta.pk.name if field == 'pk' else field
+        model_field = next(f for f in model._meta.concrete_fields if name in (f.name, f.attname))
+        value = model_field.to_python(value)
+        if value is None:
+            raise ValueError(value)
+        return value
+    
+    def get_count(self, queryset, request):
+        """
+        Count rows by the requested mode; small estimates are replaced by an exact count.
+        Подсчет строк в запрошенном режиме; малые оценки заменяются точным подсчетом.
+        """
+        mode = request.query_params.get(self.count_query_param) or getattr(settings, 'PAGINATION_COUNT', 'estimate')
+        if mode not in COUNT_MODES:
+            mode = 'exact'
+        self.count_estimated = False
+        if mode == 'none':
+            return None
+        if mode == 'estimate':
+            estimate = estimate_count(queryset)
+            if estimate is not None and estimate >= getattr(settings, 'PAGINATION_ESTIMATE_THRESHOLD', 10000):
+                self.count_estimated = True
+                return estimate
+        return queryset.order_by().count()
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.fields = self.get_keyset_fields(view)
+        self.page_size = self.get_page_size(request)
+        values, reverse = self.decode_cursor(request, queryset.model)
+        self.count = self.get_count(queryset, request)
+        
+        queryset = queryset.order_by(*(f'-{field}' if reverse else field for field in self.fields))
+        if values is not None:
+            queryset = queryset.filter(keyset_filter(self.fields, values, reverse))
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+        
+        # Going back always leaves a next page, going forward from a cursor a previous one.
+        # Переход назад всегда оставляет следующую страницу, вперед от курсора — предыдущую.
+        self.has_next = has_more if not reverse else True
+        self.has_previous = has_more if reverse else values is not None
+        self.first_key = self._key(rows[0]) if rows else values
+        self.last_key = self._key(rows[-1]) if rows else values
+        return rows
+    
+    def _key(self, row):
+        return [getattr(row, field) for field in self.fields]
+    
+    def get_next_link(self):
+        if not self.has_next or self.last_key is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.last_key, False))
+    
+    def get_previous_link(self):
+        if not self.has_previous or self.first_key is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.first_key, True))
+    
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.count,
+            'count_estimated': self.count_estimated,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+    
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'count': {'type': 'integer', 'nullable': True},
+                'count_estimated': {'type': 'boolean'},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
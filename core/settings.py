@@ -33,9 +33,11 @@ INSTALLED_APPS = [
     'users',
     'access',
     'mock',
+    'benchmarks',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -97,14 +99,103 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'users.User'
+
+# Trusted reverse proxies in front of the app: 0 uses REMOTE_ADDR and ignores
+# X-Forwarded-For (client IP for rate limits) / Число доверенных прокси перед приложением
+NUM_PROXIES = env.int('NUM_PROXIES', default=0)
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'users.authentication.CachedTokenAuthentication',
+        'users.authentication.SignedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    'NUM_PROXIES': NUM_PROXIES,
 }
 
+# Keyset pagination counts: exact, estimate or none / Подсчет при keyset-пагинации
+PAGINATION_COUNT = env.str('PAGINATION_COUNT', default='estimate')
+PAGINATION_ESTIMATE_THRESHOLD = env.int('PAGINATION_ESTIMATE_THRESHOLD', default=10000)
+
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
+# Access control cache / Кэш контроля доступа
+ACCESS_CACHE_ALIAS = 'default'
+ACCESS_PERMISSION_CACHE_TIMEOUT = env.int('ACCESS_PERMISSION_CACHE_TIMEOUT', default=300)
+ACCESS_BULK_MAX_ITEMS = env.int('ACCESS_BULK_MAX_ITEMS', default=5000)
+
+# Token authentication cache / Кэш токенной аутентификации
+TOKEN_CACHE_LOCAL_SIZE = env.int('TOKEN_CACHE_LOCAL_SIZE', default=10000)
+TOKEN_CACHE_LOCAL_TIMEOUT = env.int('TOKEN_CACHE_LOCAL_TIMEOUT', default=30)
+TOKEN_CACHE_ALIAS = env.str('TOKEN_CACHE_ALIAS', default=None)
+TOKEN_CACHE_TIMEOUT = env.int('TOKEN_CACHE_TIMEOUT', default=300)
+
+# Session tokens (seconds, 0 = no expiry) / Токены сессий (секунды, 0 = без истечения)
+SESSION_TOKEN_LIFETIME = env.int('SESSION_TOKEN_LIFETIME', default=2592000)
+SESSION_SWEEP_BATCH_SIZE = env.int('SESSION_SWEEP_BATCH_SIZE', default=1000)
+SESSION_SWEEP_PAUSE = env.float('SESSION_SWEEP_PAUSE', default=0.1)
+
+# Stateless signed tokens / Stateless подписанные токены
+STATELESS_TOKENS = env.bool('STATELESS_TOKENS', default=False)
+ACCESS_TOKEN_LIFETIME = env.int('ACCESS_TOKEN_LIFETIME', default=300)
+REFRESH_TOKEN_LIFETIME = env.int('REFRESH_TOKEN_LIFETIME', default=86400)
+
+# Password hashing pool for async views / Пул хеширования паролей для async представлений
+PASSWORD_HASHING_WORKERS = env.int('PASSWORD_HASHING_WORKERS', default=0)
+PASSWORD_HASHING_QUEUE_SIZE = env.int('PASSWORD_HASHING_QUEUE_SIZE', default=32)
+PASSWORD_HASHING_RETRY_AFTER = env.int('PASSWORD_HASHING_RETRY_AFTER', default=1)
+
+# Password hasher profile / Профиль хеширования паролей
+PASSWORD_HASHER = env.str('PASSWORD_HASHER', default='scrypt')
+SCRYPT_WORK_FACTOR = env.int('SCRYPT_WORK_FACTOR', default=2 ** 14)
+SCRYPT_BLOCK_SIZE = env.int('SCRYPT_BLOCK_SIZE', default=8)
+SCRYPT_PARALLELISM = env.int('SCRYPT_PARALLELISM', default=1)
+SCRYPT_MAXMEM = env.int('SCRYPT_MAXMEM', default=2 ** 28)
+ARGON2_TIME_COST = env.int('ARGON2_TIME_COST', default=2)
+ARGON2_MEMORY_COST = env.int('ARGON2_MEMORY_COST', default=102400)
+ARGON2_PARALLELISM = env.int('ARGON2_PARALLELISM', default=8)
+
+PASSWORD_HASHER_CLASSES = {
+    'scrypt': 'users.hashers.ProfiledScryptPasswordHasher',
+    'argon2': 'users.hashers.ProfiledArgon2PasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+# Preferred hasher first, the rest verify (and upgrade) legacy hashes.
+# Предпочтительный хешер первый, остальные проверяют (и обновляют) старые хеши.
+PASSWORD_HASHERS = [PASSWORD_HASHER_CLASSES[PASSWORD_HASHER]] + [
+    path for name, path in PASSWORD_HASHER_CLASSES.items() if name != PASSWORD_HASHER
+] + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+
+# Login rate limiting / Ограничение частоты входа
+LOGIN_RATE_LIMIT_IP = env.str('LOGIN_RATE_LIMIT_IP', default='30/m')
+LOGIN_RATE_LIMIT_EMAIL = env.str('LOGIN_RATE_LIMIT_EMAIL', default='10/m')
+LOGIN_RATE_LIMIT_STORE = env.str('LOGIN_RATE_LIMIT_STORE', default='local')
+
+# Per-request SQL query budgets by URL name / Бюджеты SQL-запросов по имени URL
+QUERY_BUDGETS = {
+    'users:register': 5,
+    'users:login': 6,
+    'users:profile': 2,
+    'users:profile-permissions': 3,
+    'mock:mock-projects': 3,
+    'mock:mock-reports': 3,
+    'access:role-list': 8,
+    'access:permission-list': 5,
+    'access:user-role-list': 5,
+    'access:object-permission-list': 8,
+    'access:check': 3,
+}
+QUERY_BUDGET_DEFAULT = env.int('QUERY_BUDGET_DEFAULT', default=None)
+QUERY_BUDGET_ACTION = env.str('QUERY_BUDGET_ACTION', default='log')
+SERVER_TIMING_HEADER = env.bool('SERVER_TIMING_HEADER', default=DEBUG)
+
+# Metrics endpoint / Endpoint метрик
+METRICS_ALLOWED_IPS = env.list('METRICS_ALLOWED_IPS', default=['127.0.0.1', '::1'])
+METRICS_DIR = env.str('METRICS_DIR', default='')
+METRICS_FLUSH_INTERVAL = env.int('METRICS_FLUSH_INTERVAL', default=5)
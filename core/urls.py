@@ -4,11 +4,13 @@ URL configuration for custom-auth-system project.
 """
 from django.contrib import admin
 from django.urls import path, include
+from . import views
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/users/', include('users.urls')),
     path('api/access/', include('access.urls')),
     path('api/mock/', include('mock.urls')),
+    path('metrics/', views.metrics, name='metrics'),
 ]
 
@@ -0,0 +1,20 @@
+"""
+Project level views.
+Представления уровня проекта.
+"""
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from .metrics import registry
+
+
+def metrics(request):
+    """
+    Metrics in Prometheus text format, served only to local addresses.
+    Requests forwarded by a proxy are rejected even from a local address.
+    Метрики в текстовом формате Prometheus, только для локальных адресов.
+    Запросы, пришедшие через прокси, отклоняются даже с локального адреса.
+    """
+    allowed = getattr(settings, 'METRICS_ALLOWED_IPS', ['127.0.0.1', '::1'])
+    if request.META.get('REMOTE_ADDR') not in allowed or 'HTTP_X_FORWARDED_FOR' in request.META:
+        raise Http404()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
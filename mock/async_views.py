@@ -0,0 +1,41 @@
+"""
+Async mock views for testing access control under ASGI.
+Асинхронные mock представления для тестирования контроля доступа под ASGI.
+"""
+from django.http import JsonResponse
+from rest_framework import status
+from access.permissions import acheck_user_permission, apermitted_object_ids
+from users.async_views import async_endpoint, permission_denied
+from .views import REPORTS, permitted_projects
+
+
+@async_endpoint('GET', authenticated=True)
+async def mock_projects(request):
+    """
+    Async mock endpoint for projects resource.
+    Асинхронный mock endpoint для ресурса projects.
+    """
+    project_ids = await apermitted_object_ids(request.user, 'projects', 'read')
+    if project_ids is not None and not project_ids:
+        return permission_denied()
+    projects = permitted_projects(project_ids)
+    return JsonResponse({
+        'message': 'Access granted to projects',
+        'data': projects,
+        'count': len(projects)
+    }, status=status.HTTP_200_OK)
+
+
+@async_endpoint('GET', authenticated=True)
+async def mock_reports(request):
+    """
+    Async mock endpoint for reports resource.
+    Асинхронный mock endpoint для ресурса reports.
+    """
+    if not await acheck_user_permission(request.user, 'reports', 'read'):
+        return permission_denied()
+    return JsonResponse({
+        'message': 'Access granted to reports',
+        'data': REPORTS,
+        'count': len(REPORTS)
+    }, status=status.HTTP_200_OK)
@@ -3,11 +3,13 @@ URLs for mock app.
 URL-маршруты для приложения mock.
 """
 from django.urls import path
-from . import views
+from . import views, async_views
 
 app_name = 'mock'
 
 urlpatterns = [
     path('projects/', views.mock_projects, name='mock-projects'),
     path('reports/', views.mock_reports, name='mock-reports'),
+    path('async/projects/', async_views.mock_projects, name='async-mock-projects'),
+    path('async/reports/', async_views.mock_reports, name='async-mock-reports'),
 ]
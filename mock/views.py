@@ -3,92 +3,93 @@ Mock views for testing access control.
 Mock представления для тестирования контроля доступа.
 """
 from rest_framework import status
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from access.permissions import HasResourcePermission
+from access.permissions import permitted_object_ids, requires
 
+PROJECTS = [
+    {
+        'id': 1,
+        'name': 'Project Alpha',
+        'description': 'First project',
+        'status': 'active',
+        'created_at': '2024-01-15T10:00:00Z'
+    },
+    {
+        'id': 2,
+        'name': 'Project Beta',
+        'description': 'Second project',
+        'status': 'in_progress',
+        'created_at': '2024-01-20T14:30:00Z'
+    },
+    {
+        'id': 3,
+        'name': 'Project Gamma',
+        'description': 'Third project',
+        'status': 'completed',
+        'created_at': '2024-01-25T09:15:00Z'
+    }
+]
 
-class ProjectsPermission(HasResourcePermission):
-    """
-    Permission class for projects resource.
-    Класс разрешений для ресурса projects.
-    """
-    resource_name = 'projects'
-    action_name = 'read'
+REPORTS = [
+    {
+        'id': 1,
+        'title': 'Monthly Report January',
+        'type': 'monthly',
+        'generated_at': '2024-01-31T23:59:59Z',
+        'file_url': '/reports/monthly-2024-01.pdf'
+    },
+    {
+        'id': 2,
+        'title': 'Quarterly Report Q1',
+        'type': 'quarterly',
+        'generated_at': '2024-03-31T23:59:59Z',
+        'file_url': '/reports/quarterly-2024-q1.pdf'
+    }
+]
 
 
-class ReportsPermission(HasResourcePermission):
+def permitted_projects(project_ids):
     """
-    Permission class for reports resource.
-    Класс разрешений для ресурса reports.
+    Projects visible with the permitted ids (None means all).
+    Проекты, видимые с доступными id (None означает все).
     """
-    resource_name = 'reports'
-    action_name = 'read'
+    if project_ids is None:
+        return PROJECTS
+    return [project for project in PROJECTS if project['id'] in project_ids]
 
 
 @api_view(['GET'])
-@permission_classes([IsAuthenticated, ProjectsPermission])
+@permission_classes([IsAuthenticated])
 def mock_projects(request):
     """
     Mock endpoint for projects resource.
+    Returns all projects with projects:read, otherwise only projects granted one by one.
     Mock endpoint для ресурса projects.
+    Возвращает все проекты при праве projects:read, иначе только выданные поштучно.
     """
-    mock_data = [
-        {
-            'id': 1,
-            'name': 'Project Alpha',
-            'description': 'First project',
-            'status': 'active',
-            'created_at': '2024-01-15T10:00:00Z'
-        },
-        {
-            'id': 2,
-            'name': 'Project Beta',
-            'description': 'Second project',
-            'status': 'in_progress',
-            'created_at': '2024-01-20T14:30:00Z'
-        },
-        {
-            'id': 3,
-            'name': 'Project Gamma',
-            'description': 'Third project',
-            'status': 'completed',
-            'created_at': '2024-01-25T09:15:00Z'
-        }
-    ]
+    project_ids = permitted_object_ids(request.user, 'projects', 'read')
+    if project_ids is not None and not project_ids:
+        raise PermissionDenied()
+    projects = permitted_projects(project_ids)
     return Response({
         'message': 'Access granted to projects',
-        'data': mock_data,
-        'count': len(mock_data)
+        'data': projects,
+        'count': len(projects)
     }, status=status.HTTP_200_OK)
 
 
 @api_view(['GET'])
-@permission_classes([IsAuthenticated, ReportsPermission])
+@requires('reports', 'read')
 def mock_reports(request):
     """
     Mock endpoint for reports resource.
     Mock endpoint для ресурса reports.
     """
-    mock_data = [
-        {
-            'id': 1,
-            'title': 'Monthly Report January',
-            'type': 'monthly',
-            'generated_at': '2024-01-31T23:59:59Z',
-            'file_url': '/reports/monthly-2024-01.pdf'
-        },
-        {
-            'id': 2,
-            'title': 'Quarterly Report Q1',
-            'type': 'quarterly',
-            'generated_at': '2024-03-31T23:59:59Z',
-            'file_url': '/reports/quarterly-2024-q1.pdf'
-        }
-    ]
     return Response({
         'message': 'Access granted to reports',
-        'data': mock_data,
-        'count': len(mock_data)
+        'data': REPORTS,
+        'count': len(REPORTS)
     }, status=status.HTTP_200_OK)
@@ -5,7 +5,7 @@ Admin configuration for users app.
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
-from .models import User
+from .models import User, SessionToken
 
 
 @admin.register(User)
@@ -35,3 +35,18 @@ class UserAdmin(BaseUserAdmin):
             'fields': ('email', 'full_name', 'password1', 'password2', 'is_staff', 'is_superuser'),
         }),
     )
+
+
+@admin.register(SessionToken)
+class SessionTokenAdmin(admin.ModelAdmin):
+    """
+    Admin interface for session tokens (read-only, keys are stored hashed).
+    Интерфейс админ-панели для токенов сессий (только чтение, ключи хранятся хешированными).
+    """
+    list_display = ('user', 'device', 'ip_address', 'created_at', 'expires_at')
+    search_fields = ('user__email', 'device')
+    list_select_related = ('user',)
+    readonly_fields = ('key_hash', 'user', 'generation', 'device', 'ip_address', 'created_at', 'expires_at')
+    
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,17 @@
+"""
+App configuration for users app.
+Конфигурация приложения users.
+"""
+from django.apps import AppConfig
+
+
+class UsersConfig(AppConfig):
+    """
+    Users app config, connects token cache invalidation signals.
+    Конфигурация приложения users, подключает сигналы инвалидации кэша токенов.
+    """
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'users'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,202 @@
+"""
+Async views for users app (ASGI).
+Асинхронные представления для приложения users (ASGI).
+
+Password hashing runs in the bounded hashing pool, so a login storm does not
+block workers serving other endpoints.
+Хеширование паролей выполняется в ограниченном пуле, поэтому волна входов
+не блокирует воркеры, обслуживающие другие endpoints.
+"""
+import functools
+import json
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from rest_framework import exceptions, status
+from rest_framework.throttling import BaseThrottle
+from core.metrics import LOGIN_ATTEMPTS
+from .authentication import aauthenticate
+from .hashing import hashing_pool, HashingPoolBusy
+from .models import User
+from .ratelimit import check_login_attempt
+from .serializers import (
+    UserRegistrationSerializer,
+    UserCredentialsSerializer,
+    UserProfileSerializer
+)
+from .sessions import aissue_session, session_response
+from .tokens import issue_tokens, stateless_tokens_enabled
+
+
+def async_endpoint(*methods, authenticated=False):
+    """
+    Decorator for async JSON endpoints: method check, CSRF exemption
+    (token authentication only), optional authentication and 503
+    back-pressure from the hashing pool.
+    Декоратор для асинхронных JSON endpoints: проверка метода, исключение из CSRF
+    (только токенная аутентификация), опциональная аутентификация и ответ 503
+    при перегрузке пула хеширования.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return JsonResponse({
+                    'detail': f'Method "{request.method}" not allowed.'
+                }, status=status.HTTP_405_METHOD_NOT_ALLOWED)
+            if authenticated:
+                try:
+                    result = await aauthenticate(request)
+                except exceptions.AuthenticationFailed as e:
+                    return not_authenticated(str(e.detail))
+                if result is None:
+                    return not_authenticated(str(exceptions.NotAuthenticated.default_detail))
+                request.user, request.auth = result
+            try:
+                return await view(request, *args, **kwargs)
+            except HashingPoolBusy:
+                response = JsonResponse({
+                    'detail': 'Server is busy, try again later. / Сервер перегружен, повторите попытку позже.'
+                }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+                response['Retry-After'] = str(getattr(settings, 'PASSWORD_HASHING_RETRY_AFTER', 1))
+                return response
+        wrapper.csrf_exempt = True
+        return wrapper
+    return decorator
+
+
+def not_authenticated(detail):
+    response = JsonResponse({'detail': detail}, status=status.HTTP_401_UNAUTHORIZED)
+    response['WWW-Authenticate'] = 'Token'
+    return response
+
+
+def permission_denied():
+    return JsonResponse({
+        'detail': str(exceptions.PermissionDenied.default_detail)
+    }, status=status.HTTP_403_FORBIDDEN)
+
+
+def parse_json(request):
+    """
+    Parse JSON request body, returns None for malformed body.
+    Разбор JSON тела запроса, возвращает None для некорректного тела.
+    """
+    try:
+        data = json.loads(request.body or b'{}')
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def json_parse_error():
+    return JsonResponse({'detail': 'JSON parse error. / Ошибка разбора JSON.'}, status=status.HTTP_400_BAD_REQUEST)
+
+
+async def throttle_login(request, data):
+    """
+    Apply login rate limits, returns 429 response or None if allowed.
+    Применение лимитов входа, возвращает ответ 429 или None, если разрешено.
+    """
+    email = data.get('email')
+    wait = await sync_to_async(check_login_attempt)(
+        BaseThrottle().get_ident(request), email if isinstance(email, str) else None
+    )
+    if wait is None:
+        return None
+    response = JsonResponse({
+        'detail': f'Request was throttled. Expected available in {int(wait) + 1} seconds.'
+    }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+    response['Retry-After'] = str(int(wait) + 1)
+    return response
+
+
+@async_endpoint('POST')
+async def register(request):
+    """
+    Async user registration endpoint.
+    Асинхронный endpoint для регистрации пользователя.
+    """
+    data = parse_json(request)
+    if data is None:
+        return json_parse_error()
+    throttled = await throttle_login(request, data)
+    if throttled:
+        return throttled
+    serializer = UserRegistrationSerializer(data=data)
+    if not await sync_to_async(serializer.is_valid)():
+        return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    validated_data = serializer.validated_data
+    user = await User.objects.acreate_user(
+        email=validated_data['email'],
+        full_name=validated_data['full_name'],
+        password=validated_data['password']
+    )
+    session, key = await aissue_session(user, request, data)
+    response = {
+        'message': 'User registered successfully. / Пользователь успешно зарегистрирован.',
+        **session_response(session, key),
+        'user': UserProfileSerializer(user).data
+    }
+    if stateless_tokens_enabled():
+        response.update(await sync_to_async(issue_tokens)(user, session))
+    return JsonResponse(response, status=status.HTTP_201_CREATED)
+
+
+@async_endpoint('POST')
+async def login(request):
+    """
+    Async user login endpoint.
+    Асинхронный endpoint для входа пользователя.
+    """
+    data = parse_json(request)
+    if data is None:
+        return json_parse_error()
+    throttled = await throttle_login(request, data)
+    if throttled:
+        return throttled
+    serializer = UserCredentialsSerializer(data=data)
+    if not serializer.is_valid():
+        LOGIN_ATTEMPTS.inc(result='failure')
+        return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    email = serializer.validated_data['email']
+    password = serializer.validated_data['password']
+    user = await User.objects.filter(email=email).afirst()
+    if user is None:
+        # Run the hasher anyway to keep response time uniform, as ModelBackend does.
+        # Хешер запускается в любом случае для одинакового времени ответа, как в ModelBackend.
+        await hashing_pool.make_password(password)
+        is_valid, new_encoded = False, None
+    else:
+        is_valid, new_encoded = await hashing_pool.check_password(password, user.password)
+    
+    if not is_valid or not user.is_active:
+        LOGIN_ATTEMPTS.inc(result='failure')
+        return JsonResponse({
+            'non_field_errors': ['Invalid email or password. / Неверный email или пароль.']
+        }, status=status.HTTP_400_BAD_REQUEST)
+    if new_encoded:
+        user.password = new_encoded
+        await user.asave(update_fields=['password'])
+    
+    LOGIN_ATTEMPTS.inc(result='success')
+    session, key = await aissue_session(user, request, data)
+    response = {
+        'message': 'Login successful. / Вход выполнен успешно.',
+        **session_response(session, key),
+        'user': UserProfileSerializer(user).data
+    }
+    if stateless_tokens_enabled():
+        response.update(await sync_to_async(issue_tokens)(user, session))
+    return JsonResponse(response, status=status.HTTP_200_OK)
+
+
+@async_endpoint('GET', authenticated=True)
+async def profile(request):
+    """
+    Async get user profile endpoint.
+    Асинхронный endpoint получения профиля пользователя.
+    """
+    return JsonResponse(UserProfileSerializer(request.user).data, status=status.HTTP_200_OK)
@@ -0,0 +1,223 @@
+"""
+Authentication classes for users app.
+Классы аутентификации для приложения users.
+
+Besides the DRF authenticate() method, classes provide aauthenticate()
+used by async views, which resolves credentials with async cache and ORM APIs.
+Помимо метода authenticate() из DRF, классы предоставляют aauthenticate()
+для асинхронных представлений, который использует async API кэша и ORM.
+"""
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, TokenAuthentication, get_authorization_header
+from rest_framework.settings import api_settings
+from .cache import token_user_cache, USER_ID_KEY
+from .models import User, SessionToken
+from .sessions import hash_key
+from .tokens import InvalidToken, stateless_tokens_enabled, verify_access_token
+
+
+def get_credentials(request, keyword):
+    """
+    Get credentials for the keyword from the Authorization header.
+    Returns None if the header uses another keyword.
+    Получение учетных данных для ключевого слова из заголовка Authorization.
+    Возвращает None, если заголовок использует другое ключевое слово.
+    """
+    auth = get_authorization_header(request).split()
+    if not auth or auth[0].lower() != keyword.lower().encode():
+        return None
+    if len(auth) == 1:
+        raise exceptions.AuthenticationFailed(_('Invalid token header. No credentials provided.'))
+    if len(auth) > 2:
+        raise exceptions.AuthenticationFailed(_('Invalid token header. Token string should not contain spaces.'))
+    try:
+        return auth[1].decode()
+    except UnicodeError:
+        raise exceptions.AuthenticationFailed(
+            _('Invalid token header. Token string should not contain invalid characters.')
+        )
+
+
+def get_cached_user(user_id):
+    """
+    Get user by id, using the cache.
+    Получение пользователя по id с использованием кэша.
+    """
+    key = USER_ID_KEY.format(pk=user_id)
+    user = token_user_cache.get(key)
+    if user is None:
+        user = User.objects.filter(pk=user_id).first()
+        if user is not None:
+            token_user_cache.set(key, user)
+    return user
+
+
+async def aget_cached_user(user_id):
+    """
+    Async variant of get_cached_user.
+    Асинхронный вариант get_cached_user.
+    """
+    key = USER_ID_KEY.format(pk=user_id)
+    user = await token_user_cache.aget(key)
+    if user is None:
+        user = await User.objects.filter(pk=user_id).afirst()
+        if user is not None:
+            await token_user_cache.aset(key, user)
+    return user
+
+
+def session_entry(session):
+    """
+    Cacheable copy of a session token without the related user.
+    Кэшируемая копия токена сессии без связанного пользователя.
+    """
+    return SessionToken(
+        pk=session.pk, key_hash=session.key_hash, user_id=session.user_id,
+        generation=session.generation, expires_at=session.expires_at,
+    )
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Session token authentication ("Authorization: Token <key>") that caches
+    token to user resolution instead of querying it on every request.
+    Tokens are looked up by key hash, expiry and revocation (generation)
+    are checked in memory.
+    Аутентификация по токенам сессий ("Authorization: Token <key>"), которая
+    кэширует разрешение токена в пользователя вместо запроса на каждый запрос.
+    Токены ищутся по хешу ключа, срок действия и отзыв (поколение)
+    проверяются в памяти.
+    """
+    model = SessionToken
+    
+    def check_session(self, session, user):
+        """
+        Check expiry, user state and generation, returns (user, session).
+        Проверка срока действия, состояния пользователя и поколения, возвращает (user, session).
+        """
+        if session.expires_at is not None and session.expires_at <= timezone.now():
+            raise exceptions.AuthenticationFailed('Token has expired. / Срок действия токена истек.')
+        if user is None or not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        if session.generation != user.token_generation:
+            raise exceptions.AuthenticationFailed('Token has been revoked. / Токен отозван.')
+        session.user = user
+        return (user, session)
+    
+    def authenticate_credentials(self, key):
+        """
+        Resolve token key to user, using the cache.
+        Разрешение ключа токена в пользователя с использованием кэша.
+        """
+        key_hash = hash_key(key)
+        session = token_user_cache.get(key_hash)
+        if session is None:
+            session = SessionToken.objects.select_related('user').filter(key_hash=key_hash).first()
+            if session is None:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            token_user_cache.set(USER_ID_KEY.format(pk=session.user_id), session.user)
+            user, session = session.user, session_entry(session)
+            token_user_cache.set(key_hash, session)
+        else:
+            user = get_cached_user(session.user_id)
+        return self.check_session(session, user)
+    
+    async def aauthenticate(self, request):
+        """
+        Async variant of authenticate.
+        Асинхронный вариант authenticate.
+        """
+        key = get_credentials(request, self.keyword)
+        if key is None:
+            return None
+        
+        key_hash = hash_key(key)
+        session = await token_user_cache.aget(key_hash)
+        if session is None:
+            session = await SessionToken.objects.select_related('user').filter(key_hash=key_hash).afirst()
+            if session is None:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            await token_user_cache.aset(USER_ID_KEY.format(pk=session.user_id), session.user)
+            user, session = session.user, session_entry(session)
+            await token_user_cache.aset(key_hash, session)
+        else:
+            user = await aget_cached_user(session.user_id)
+        return self.check_session(session, user)
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    """
+    Authentication by stateless signed access tokens.
+    Header format: "Authorization: Bearer <access_token>".
+    Аутентификация по stateless подписанным токенам доступа.
+    Формат заголовка: "Authorization: Bearer <access_token>".
+    """
+    keyword = 'Bearer'
+    
+    def get_payload(self, request):
+        """
+        Verify signed token in CPU and return its payload.
+        Проверка подписанного токена без БД, возвращает его данные.
+        """
+        if not stateless_tokens_enabled():
+            return None
+        token = get_credentials(request, self.keyword)
+        if token is None:
+            return None
+        try:
+            return verify_access_token(token)
+        except InvalidToken as e:
+            raise exceptions.AuthenticationFailed(str(e))
+    
+    def check_user(self, user, payload):
+        """
+        Check that the user is active and the token is not revoked.
+        Проверка, что пользователь активен и токен не отозван.
+        """
+        if user is None or not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        if user.token_generation != payload['gen']:
+            raise exceptions.AuthenticationFailed('Token has been revoked. / Токен отозван.')
+        return (user, payload)
+    
+    def authenticate(self, request):
+        """
+        Verify signed token and resolve user through the cache.
+        Проверка подписанного токена и получение пользователя через кэш.
+        """
+        payload = self.get_payload(request)
+        if payload is None:
+            return None
+        return self.check_user(get_cached_user(payload['uid']), payload)
+    
+    async def aauthenticate(self, request):
+        """
+        Async variant of authenticate.
+        Асинхронный вариант authenticate.
+        """
+        payload = self.get_payload(request)
+        if payload is None:
+            return None
+        return self.check_user(await aget_cached_user(payload['uid']), payload)
+    
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+async def aauthenticate(request):
+    """
+    Authenticate request in async views with the configured DRF authentication
+    classes that provide aauthenticate(). Returns (user, auth) or None.
+    Аутентификация запроса в асинхронных представлениях настроенными классами
+    аутентификации DRF, у которых есть aauthenticate(). Возвращает (user, auth) или None.
+    """
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        authenticator = authentication_class()
+        if not hasattr(authenticator, 'aauthenticate'):
+            continue
+        result = await authenticator.aauthenticate(request)
+        if result is not None:
+            return result
+    return None
@@ -0,0 +1,214 @@
+"""
+Two-tier cache for token to user resolution.
+Двухуровневый кэш для разрешения токена в пользователя.
+
+Session token entries are keyed by the key hash and hold (user id,
+generation, expiry); users are cached separately under USER_ID_KEY,
+without the password hash. Invalidation clears the shared tier and the LRU
+of the current process only: other processes may keep accepting a revoked
+token or a deactivated user for up to TOKEN_CACHE_LOCAL_TIMEOUT seconds.
+Записи токенов сессий хранятся по хешу ключа и содержат (id пользователя,
+поколение, срок действия); пользователи кэшируются отдельно по USER_ID_KEY,
+без хеша пароля. Инвалидация очищает общий уровень и LRU только текущего
+процесса: другие процессы могут принимать отозванный токен или
+деактивированного пользователя до TOKEN_CACHE_LOCAL_TIMEOUT секунд.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.core.cache import caches
+from core.metrics import TOKEN_CACHE_LOOKUPS
+
+TOKEN_USER_KEY = 'users:token:{key}'
+USER_ID_KEY = 'user:{pk}'
+
+# User fields never put into the cache / Поля пользователя, которые не кэшируются
+UNCACHED_USER_FIELDS = ('password',)
+
+
+def cacheable(value):
+    """
+    Copy of a value for the cache. Users are rebuilt with the password hash
+    deferred, so it never lands in a shared cache; save() of a deferred
+    instance writes only loaded fields, so the hash is never overwritten.
+    Копия значения для кэша. Пользователи пересобираются с отложенным хешем
+    пароля, поэтому он не попадает в общий кэш; save() такого экземпляра
+    записывает только загруженные поля, поэтому хеш не перезаписывается.
+    """
+    if not isinstance(value, AbstractBaseUser):
+        return copy.copy(value)
+    fields = [f.attname for f in value._meta.concrete_fields if f.attname not in UNCACHED_USER_FIELDS]
+    return type(value).from_db(value._state.db, fields, [getattr(value, name) for name in fields])
+
+
+class LocalLRUCache:
+    """
+    Thread-safe in-process LRU cache with TTL.
+    Потокобезопасный LRU-кэш в памяти процесса с временем жизни.
+    """
+    
+    def __init__(self, maxsize, timeout):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """
+        Get value or None if missing or expired.
+        Получение значения или None, если оно отсутствует или устарело.
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key, value):
+        """
+        Store value, evicting the least recently used entry when full.
+        Сохранение значения с вытеснением давно не использованной записи.
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.timeout)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def delete(self, key):
+        """
+        Remove value.
+        Удаление значения.
+        """
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self):
+        """
+        Remove all values.
+        Удаление всех значений.
+        """
+        with self._lock:
+            self._data.clear()
+
+
+class TokenUserCache:
+    """
+    Token to user cache: local LRU plus an optional shared cache tier.
+    Local entries cannot be invalidated from other processes,
+    so they should live shorter than shared ones.
+    Кэш токен → пользователь: локальный LRU и опциональный общий уровень.
+    Локальные записи нельзя инвалидировать из других процессов,
+    поэтому они должны жить меньше общих.
+    """
+    
+    def __init__(self):
+        self.local = LocalLRUCache(
+            getattr(settings, 'TOKEN_CACHE_LOCAL_SIZE', 10000),
+            getattr(settings, 'TOKEN_CACHE_LOCAL_TIMEOUT', 30),
+        )
+    
+    @property
+    def shared(self):
+        alias = getattr(settings, 'TOKEN_CACHE_ALIAS', None)
+        return caches[alias] if alias else None
+    
+    def get(self, key):
+        """
+        Get a copy of the cached user for the token key.
+        Получение копии закэшированного пользователя по ключу токена.
+        """
+        user = self.local.get(key)
+        result = 'local_hit'
+        if user is None and self.shared is not None:
+            user = self.shared.get(TOKEN_USER_KEY.format(key=key))
+            result = 'shared_hit'
+            if user is not None:
+                self.local.set(key, user)
+        TOKEN_CACHE_LOOKUPS.inc(result=result if user is not None else 'miss')
+        # Views modify request.user, never hand out the shared instance.
+        # Представления изменяют request.user, общий экземпляр не отдается.
+        return copy.copy(user) if user is not None else None
+    
+    async def aget(self, key):
+        """
+        Async variant of get, the shared tier is read with the async cache API.
+        Асинхронный вариант get, общий уровень читается через async API кэша.
+        """
+        user = self.local.get(key)
+        result = 'local_hit'
+        if user is None and self.shared is not None:
+            user = await self.shared.aget(TOKEN_USER_KEY.format(key=key))
+            result = 'shared_hit'
+            if user is not None:
+                self.local.set(key, user)
+        TOKEN_CACHE_LOOKUPS.inc(result=result if user is not None else 'miss')
+        return copy.copy(user) if user is not None else None
+    
+    def set(self, key, user):
+        """
+        Cache user for the token key.
+        Кэширование пользователя по ключу токена.
+        """
+        user = cacheable(user)
+        self.local.set(key, user)
+        if self.shared is not None:
+            self.shared.set(
+                TOKEN_USER_KEY.format(key=key), user,
+                getattr(settings, 'TOKEN_CACHE_TIMEOUT', 300)
+            )
+    
+    async def aset(self, key, user):
+        """
+        Async variant of set.
+        Асинхронный вариант set.
+        """
+        user = cacheable(user)
+        self.local.set(key, user)
+        if self.shared is not None:
+            await self.shared.aset(
+                TOKEN_USER_KEY.format(key=key), user,
+                getattr(settings, 'TOKEN_CACHE_TIMEOUT', 300)
+            )
+    
+    def delete(self, key):
+        """
+        Invalidate token key in both tiers.
+        Инвалидация ключа токена на обоих уровнях.
+        """
+        self.local.delete(key)
+        if self.shared is not None:
+            self.shared.delete(TOKEN_USER_KEY.format(key=key))
+
+
+token_user_cache = TokenUserCache()
+
+
+def invalidate_token(key):
+    """
+    Invalidate cached resolution of a token key.
+    Инвалидация закэшированного разрешения ключа токена.
+    """
+    if key:
+        token_user_cache.delete(key)
+
+
+def invalidate_user_tokens(user):
+    """
+    Invalidate the cached user behind all tokens of the user. Token entries
+    only hold the user id and generation, so one key covers every session.
+    Инвалидация закэшированного пользователя для всех его токенов. Записи
+    токенов хранят только id пользователя и поколение, поэтому один ключ
+    покрывает все сессии.
+    """
+    invalidate_token(USER_ID_KEY.format(pk=user.pk))
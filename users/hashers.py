@@ -0,0 +1,85 @@
+"""
+Password hashers with a per-deployment cost profile.
+Хешеры паролей с профилем стоимости для каждого развертывания.
+
+Cost parameters are read from settings, so they can be tuned per machine
+with the benchmark_hasher command. Hashes created with other parameters
+(or other algorithms, e.g. legacy PBKDF2) are upgraded on successful login.
+Параметры стоимости читаются из настроек, поэтому их можно подобрать для
+каждой машины командой benchmark_hasher. Хеши, созданные с другими
+параметрами (или другими алгоритмами, например PBKDF2), обновляются
+при успешном входе.
+"""
+import threading
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, ScryptPasswordHasher
+from core.metrics import PASSWORD_HASH_SECONDS
+
+_timing = threading.local()
+
+
+class TimedHasherMixin:
+    """
+    Record encode/verify duration. Nested calls (scrypt verify calls encode)
+    are recorded once, by the outer operation.
+    Запись длительности encode/verify. Вложенные вызовы (verify у scrypt
+    вызывает encode) учитываются один раз, внешней операцией.
+    """
+    
+    def timed(self, operation, func, *args, **kwargs):
+        if getattr(_timing, 'active', False):
+            return func(*args, **kwargs)
+        _timing.active = True
+        try:
+            with PASSWORD_HASH_SECONDS.time(algorithm=self.algorithm, operation=operation):
+                return func(*args, **kwargs)
+        finally:
+            _timing.active = False
+    
+    def encode(self, *args, **kwargs):
+        return self.timed('encode', super().encode, *args, **kwargs)
+    
+    def verify(self, *args, **kwargs):
+        return self.timed('verify', super().verify, *args, **kwargs)
+
+
+class ProfiledScryptPasswordHasher(TimedHasherMixin, ScryptPasswordHasher):
+    """
+    Scrypt hasher with cost parameters from settings.
+    Хешер scrypt с параметрами стоимости из настроек.
+    """
+    
+    @property
+    def work_factor(self):
+        return getattr(settings, 'SCRYPT_WORK_FACTOR', 2 ** 14)
+    
+    @property
+    def block_size(self):
+        return getattr(settings, 'SCRYPT_BLOCK_SIZE', 8)
+    
+    @property
+    def parallelism(self):
+        return getattr(settings, 'SCRYPT_PARALLELISM', 1)
+    
+    @property
+    def maxmem(self):
+        return getattr(settings, 'SCRYPT_MAXMEM', 2 ** 28)
+
+
+class ProfiledArgon2PasswordHasher(TimedHasherMixin, Argon2PasswordHasher):
+    """
+    Argon2 hasher with cost parameters from settings (requires argon2-cffi).
+    Хешер Argon2 с параметрами стоимости из настроек (требуется argon2-cffi).
+    """
+    
+    @property
+    def time_cost(self):
+        return getattr(settings, 'ARGON2_TIME_COST', 2)
+    
+    @property
+    def memory_cost(self):
+        return getattr(settings, 'ARGON2_MEMORY_COST', 102400)
+    
+    @property
+    def parallelism(self):
+        return getattr(settings, 'ARGON2_PARALLELISM', 8)
@@ -0,0 +1,119 @@
+"""
+Bounded process pool for password hashing.
+Ограниченный пул процессов для хеширования паролей.
+
+Password hashers are pure CPU work of hundreds of milliseconds, so async views
+offload them to worker processes instead of blocking the event loop or a
+request thread. When all workers are busy and the queue is full,
+HashingPoolBusy is raised so the caller can answer 503 with Retry-After.
+Хешеры паролей — чисто вычислительная работа в сотни миллисекунд, поэтому
+асинхронные представления выносят ее в процессы-воркеры, не блокируя цикл
+событий или поток запроса. Когда все воркеры заняты и очередь заполнена,
+выбрасывается HashingPoolBusy, чтобы вызывающий код ответил 503 с Retry-After.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+
+
+class HashingPoolBusy(Exception):
+    """
+    Raised when the hashing pool queue is full.
+    Исключение при заполненной очереди пула хеширования.
+    """
+
+
+def _init_worker(settings_module):
+    """
+    Set up Django in a worker process.
+    Настройка Django в процессе-воркере.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def _make_password(password):
+    from django.contrib.auth.hashers import make_password
+    return make_password(password)
+
+
+def _check_password(password, encoded):
+    """
+    Check password and, when the stored hash is outdated, compute a new one.
+    Returns (is_valid, new_encoded_or_None).
+    Проверка пароля и вычисление нового хеша, если сохраненный устарел.
+    Возвращает (пароль верен, новый хеш или None).
+    """
+    from django.contrib.auth.hashers import check_password, make_password
+    updated = []
+    is_valid = check_password(password, encoded, setter=lambda raw: updated.append(make_password(raw)))
+    return is_valid, (updated[0] if updated else None)
+
+
+class HashingPool:
+    """
+    Process pool with a bounded number of in-flight hashing jobs.
+    Пул процессов с ограниченным числом выполняющихся задач хеширования.
+    """
+    
+    def __init__(self):
+        self._executor = None
+        self._pending = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def workers(self):
+        return getattr(settings, 'PASSWORD_HASHING_WORKERS', 0) or os.cpu_count() or 1
+    
+    @property
+    def capacity(self):
+        return self.workers + getattr(settings, 'PASSWORD_HASHING_QUEUE_SIZE', 32)
+    
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'core.settings'),),
+                )
+            return self._executor
+    
+    async def run(self, func, *args):
+        """
+        Run func in the pool or raise HashingPoolBusy when the queue is full.
+        Выполнение func в пуле или HashingPoolBusy при заполненной очереди.
+        """
+        executor = self.executor
+        with self._lock:
+            if self._pending >= self.capacity:
+                raise HashingPoolBusy()
+            self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+    
+    async def make_password(self, password):
+        """
+        Hash password with the preferred hasher.
+        Хеширование пароля предпочтительным хешером.
+        """
+        return await self.run(_make_password, password)
+    
+    async def check_password(self, password, encoded):
+        """
+        Check password, returns (is_valid, new_encoded_or_None).
+        Проверка пароля, возвращает (пароль верен, новый хеш или None).
+        """
+        return await self.run(_check_password, password, encoded)
+
+
+hashing_pool = HashingPool()
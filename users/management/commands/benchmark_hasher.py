@@ -0,0 +1,118 @@
+"""
+Benchmark password hasher and recommend cost parameters.
+Бенчмарк хешера паролей и рекомендация параметров стоимости.
+"""
+import statistics
+import time
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, ScryptPasswordHasher
+from django.core.management.base import BaseCommand, CommandError
+
+PASSWORD = 'benchmark-password-123'
+
+
+class Command(BaseCommand):
+    """
+    Measure hashing latency on this machine and pick parameters hitting the target.
+    Измерение задержки хеширования на этой машине и подбор параметров под цель.
+    """
+    help = 'Benchmark password hasher and recommend cost parameters / Бенчмарк хешера паролей'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--algorithm', choices=['scrypt', 'argon2'], default='scrypt')
+        parser.add_argument('--target-ms', type=float, default=50.0, help='Target hash latency in ms')
+        parser.add_argument('--rounds', type=int, default=5, help='Hashes per measurement')
+    
+    def measure(self, hasher, rounds):
+        """
+        Median hash latency in milliseconds.
+        Медианная задержка хеширования в миллисекундах.
+        """
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            hasher.encode(PASSWORD, hasher.salt())
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+    
+    def handle(self, *args, **options):
+        algorithm = options['algorithm']
+        target = options['target_ms']
+        rounds = options['rounds']
+        self.stdout.write(f'Benchmarking {algorithm}, target {target:.1f} ms, {rounds} rounds per step')
+        
+        if algorithm == 'scrypt':
+            recommended = self.benchmark_scrypt(target, rounds)
+        else:
+            recommended = self.benchmark_argon2(target, rounds)
+        
+        self.stdout.write(self.style.SUCCESS('Recommended settings / Рекомендуемые настройки:'))
+        self.stdout.write(f'PASSWORD_HASHER={algorithm}')
+        for name, value in recommended.items():
+            self.stdout.write(f'{name}={value}')
+    
+    def benchmark_scrypt(self, target, rounds):
+        """
+        Double work factor until the target latency is exceeded. The
+        recommendation includes SCRYPT_MAXMEM with 2x headroom over the
+        scrypt memory (128 * r * N * p), since hashing fails above the limit.
+        Удвоение work factor до превышения целевой задержки. Рекомендация
+        включает SCRYPT_MAXMEM с двукратным запасом над памятью scrypt
+        (128 * r * N * p), так как выше лимита хеширование падает.
+        """
+        hasher = ScryptPasswordHasher()
+        hasher.maxmem = 2 ** 30
+        best = None
+        work_factor = 2 ** 10
+        while work_factor <= 2 ** 19:
+            hasher.work_factor = work_factor
+            elapsed = self.measure(hasher, rounds)
+            memory = 128 * hasher.block_size * work_factor // 2 ** 20
+            self.stdout.write(f'  work_factor={work_factor:<8} {elapsed:8.1f} ms  ~{memory} MiB')
+            if elapsed > target:
+                break
+            best = work_factor
+            work_factor *= 2
+        if best is None:
+            raise CommandError('Target latency is lower than the cheapest profile / Цель ниже минимального профиля')
+        configured = getattr(settings, 'SCRYPT_MAXMEM', 2 ** 28)
+        maxmem = max(configured, 2 * 128 * hasher.block_size * best * hasher.parallelism)
+        if maxmem > configured:
+            self.stdout.write(self.style.WARNING(
+                f'SCRYPT_WORK_FACTOR={best} needs SCRYPT_MAXMEM={maxmem}, configured {configured}: '
+                f'raise it or hashing will fail / '
+                f'SCRYPT_WORK_FACTOR={best} требует SCRYPT_MAXMEM={maxmem}, задано {configured}: '
+                f'увеличьте его, иначе хеширование упадет'
+            ))
+        return {
+            'SCRYPT_WORK_FACTOR': best,
+            'SCRYPT_BLOCK_SIZE': hasher.block_size,
+            'SCRYPT_PARALLELISM': hasher.parallelism,
+            'SCRYPT_MAXMEM': maxmem,
+        }
+    
+    def benchmark_argon2(self, target, rounds):
+        """
+        Increase time cost at fixed memory cost until the target is exceeded.
+        Увеличение time cost при фиксированной памяти до превышения цели.
+        """
+        hasher = Argon2PasswordHasher()
+        try:
+            hasher._load_library()
+        except ValueError as e:
+            raise CommandError(str(e))
+        best = None
+        for time_cost in range(1, 21):
+            hasher.time_cost = time_cost
+            elapsed = self.measure(hasher, rounds)
+            self.stdout.write(f'  time_cost={time_cost:<3} {elapsed:8.1f} ms  {hasher.memory_cost // 1024} MiB')
+            if elapsed > target:
+                break
+            best = time_cost
+        if best is None:
+            raise CommandError('Target latency is lower than the cheapest profile / Цель ниже минимального профиля')
+        return {
+            'ARGON2_TIME_COST': best,
+            'ARGON2_MEMORY_COST': hasher.memory_cost,
+            'ARGON2_PARALLELISM': hasher.parallelism,
+        }
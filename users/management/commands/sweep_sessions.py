@@ -0,0 +1,61 @@
+"""
+Delete expired and revoked session tokens in bounded batches.
+Удаление истекших и отозванных токенов сессий ограниченными пакетами.
+"""
+import time
+from django.core.management.base import BaseCommand, CommandError
+from users.sessions import stale_sessions_queryset, sweep_sessions
+
+
+class Command(BaseCommand):
+    """
+    Sweep stale session tokens batch by batch and report the delete rate.
+    Run it from cron or with --every as a long-running worker.
+    Очистка устаревших токенов сессий пакетами с отчетом о скорости удаления.
+    Запускается из cron или с --every как постоянно работающий процесс.
+    """
+    help = 'Delete expired and revoked session tokens / Удаление истекших и отозванных токенов сессий'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Rows per batch (default: SESSION_SWEEP_BATCH_SIZE)')
+        parser.add_argument('--pause', type=float, help='Seconds between batches (default: SESSION_SWEEP_PAUSE)')
+        parser.add_argument('--max-batches', type=int, help='Stop after this many batches')
+        parser.add_argument('--every', type=float, help='Repeat the sweep every N seconds / Повторять каждые N секунд')
+        parser.add_argument('--dry-run', action='store_true', help='Only count stale tokens / Только подсчет')
+    
+    def handle(self, *args, **options):
+        if options['batch_size'] is not None and options['batch_size'] <= 0:
+            raise CommandError('--batch-size must be positive / --batch-size должен быть положительным')
+        if options['dry_run']:
+            count = stale_sessions_queryset().count()
+            self.stdout.write(f'Stale session tokens: {count} / Устаревших токенов сессий: {count}')
+            return
+        while True:
+            self.sweep(options)
+            if not options['every']:
+                return
+            time.sleep(options['every'])
+    
+    def sweep(self, options):
+        """
+        One pass over the table, prints per-batch (with -v 2) and total rates.
+        Один проход по таблице, выводит скорость по пакетам (с -v 2) и общую.
+        """
+        started = time.perf_counter()
+        total = batches = 0
+        sql_seconds = 0.0
+        for deleted, seconds in sweep_sessions(options['batch_size'], options['pause'], options['max_batches']):
+            total += deleted
+            batches += 1
+            sql_seconds += seconds
+            if options['verbosity'] >= 2:
+                self.stdout.write(f'  batch {batches}: {deleted} rows in {seconds * 1000:.1f} ms')
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {total} rows in {batches} batches, {elapsed:.2f} s: '
+            f'{total / elapsed if elapsed else 0:.0f} rows/s overall, '
+            f'{total / sql_seconds if sql_seconds else 0:.0f} rows/s in SQL / '
+            f'Удалено {total} строк за {batches} пакетов, {elapsed:.2f} с: '
+            f'{total / elapsed if elapsed else 0:.0f} строк/с всего, '
+            f'{total / sql_seconds if sql_seconds else 0:.0f} строк/с в SQL'
+        ))
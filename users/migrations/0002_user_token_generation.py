@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="user",
+            options={
+                "verbose_name": "User / Пользователь",
+                "verbose_name_plural": "Users / Пользователи",
+            },
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="token_generation",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
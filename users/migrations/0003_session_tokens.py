@@ -0,0 +1,77 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:10
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+import django.db.models.deletion
+import hashlib
+from datetime import timedelta
+
+
+def import_drf_tokens(apps, schema_editor):
+    # Legacy keys get the regular session lifetime, then the plaintext rows go.
+    # Старые ключи получают обычное время жизни сессии, затем строки с открытыми ключами удаляются.
+    Token = apps.get_model("authtoken", "Token")
+    SessionToken = apps.get_model("users", "SessionToken")
+    lifetime = getattr(settings, "SESSION_TOKEN_LIFETIME", 2592000)
+    expires_at = timezone.now() + timedelta(seconds=lifetime) if lifetime else None
+    sessions = [
+        SessionToken(
+            key_hash=hashlib.sha256(key.encode()).hexdigest(),
+            user_id=user_id,
+            generation=generation,
+            device="legacy",
+            expires_at=expires_at,
+        )
+        for key, user_id, generation in Token.objects.values_list(
+            "key", "user_id", "user__token_generation"
+        ).iterator()
+    ]
+    SessionToken.objects.bulk_create(sessions, batch_size=1000)
+    Token.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_user_token_generation"),
+        ("authtoken", "0003_tokenproxy"),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name="SessionToken",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key_hash", models.CharField(max_length=64, unique=True)),
+                ("generation", models.PositiveIntegerField(default=0)),
+                ("device", models.CharField(blank=True, max_length=255)),
+                ("ip_address", models.GenericIPAddressField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("expires_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="session_tokens",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Session token / Токен сессии",
+                "verbose_name_plural": "Session tokens / Токены сессий",
+                "db_table": "session_tokens",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.RunPython(import_drf_tokens, migrations.RunPython.noop),
+    ]
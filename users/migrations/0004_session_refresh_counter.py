@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0003_session_tokens"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="sessiontoken",
+            name="refresh_counter",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
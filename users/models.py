@@ -25,6 +25,24 @@ class UserManager(BaseUserManager):
         user.save(using=self._db)
         return user
     
+    async def acreate_user(self, email, full_name, password=None, **extra_fields):
+        """
+        Create and save a regular user, hashing the password in the hashing pool.
+        Создание и сохранение обычного пользователя с хешированием пароля в пуле.
+        """
+        from .hashing import hashing_pool
+        
+        if not email:
+            raise ValueError('The Email field must be set / Поле Email должно быть заполнено')
+        email = self.normalize_email(email)
+        user = self.model(email=email, full_name=full_name, **extra_fields)
+        if password is None:
+            user.set_unusable_password()
+        else:
+            user.password = await hashing_pool.make_password(password)
+        await user.asave(using=self._db)
+        return user
+    
     def create_superuser(self, email, full_name, password=None, **extra_fields):
         """
         Create and save a superuser.
@@ -53,6 +71,7 @@ class User(AbstractBaseUser):
     is_superuser = models.BooleanField(default=False)
     date_joined = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    token_generation = models.PositiveIntegerField(default=0)
     
     objects = UserManager()
     
@@ -80,3 +99,33 @@ class User(AbstractBaseUser):
         Проверка прав для Django admin.
         """
         return self.is_superuser
+
+
+class SessionToken(models.Model):
+    """
+    Authentication token of one login session (device). A user may have many;
+    only the SHA-256 of the key is stored. A token is valid while its
+    generation equals User.token_generation and it has not expired.
+    refresh_counter is the step of the session's signed refresh token chain.
+    Токен аутентификации одной сессии входа (устройства). У пользователя их
+    может быть много; хранится только SHA-256 ключа. Токен действителен, пока
+    его поколение равно User.token_generation и срок не истек.
+    refresh_counter — шаг цепочки подписанных токенов обновления сессии.
+    """
+    key_hash = models.CharField(max_length=64, unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='session_tokens')
+    generation = models.PositiveIntegerField(default=0)
+    device = models.CharField(max_length=255, blank=True)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+    refresh_counter = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'session_tokens'
+        verbose_name = 'Session token / Токен сессии'
+        verbose_name_plural = 'Session tokens / Токены сессий'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f'{self.user_id}: {self.device or "-"}'
@@ -0,0 +1,150 @@
+"""
+Sliding-window rate limiting for login and registration.
+Ограничение частоты входа и регистрации скользящим окном.
+
+Attempts are counted per client IP and per email before authenticate() runs,
+so over-limit requests never reach the password hasher. The client IP is
+REMOTE_ADDR unless NUM_PROXIES trusted proxies append X-Forwarded-For.
+Попытки считаются по IP клиента и по email до вызова authenticate(),
+поэтому запросы сверх лимита не доходят до хешера паролей. IP клиента —
+REMOTE_ADDR, если только NUM_PROXIES доверенных прокси не добавляют X-Forwarded-For.
+"""
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+class LocalMemoryStore:
+    """
+    In-process counter store. Counters are per worker process.
+    Хранилище счетчиков в памяти процесса. Счетчики у каждого процесса свои.
+    """
+    max_entries = 100000
+    
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+    
+    def incr(self, key, timeout):
+        """
+        Increment counter, returns new value.
+        Увеличение счетчика, возвращает новое значение.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if len(self._data) >= self.max_entries:
+                self._data = {k: v for k, v in self._data.items() if v[0] > now}
+            expires_at, count = self._data.get(key, (0, 0))
+            if expires_at <= now:
+                expires_at, count = now + timeout, 0
+            self._data[key] = (expires_at, count + 1)
+            return count + 1
+    
+    def get(self, key):
+        """
+        Get counter value.
+        Получение значения счетчика.
+        """
+        with self._lock:
+            expires_at, count = self._data.get(key, (0, 0))
+        return count if expires_at > time.monotonic() else 0
+
+
+class CacheStore:
+    """
+    Counter store in a shared Django cache backend, counters are shared by workers.
+    Хранилище счетчиков в общем кэше Django, счетчики общие для всех воркеров.
+    """
+    
+    def __init__(self, alias):
+        self.cache = caches[alias]
+    
+    def incr(self, key, timeout):
+        self.cache.add(key, 0, timeout)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, 1, timeout)
+            return 1
+    
+    def get(self, key):
+        return self.cache.get(key) or 0
+
+
+_local_store = LocalMemoryStore()
+
+
+def get_store():
+    """
+    Return configured counter store: "local" or a cache alias.
+    Возвращает настроенное хранилище счетчиков: "local" или алиас кэша.
+    """
+    store = getattr(settings, 'LOGIN_RATE_LIMIT_STORE', 'local')
+    return _local_store if store == 'local' else CacheStore(store)
+
+
+class SlidingWindowLimiter:
+    """
+    Sliding window counter: the previous fixed window is weighted by its overlap
+    with the sliding window, so only two counters are kept per key.
+    Счетчик скользящего окна: предыдущее фиксированное окно учитывается с весом
+    его перекрытия со скользящим окном, поэтому на ключ хранится два счетчика.
+    """
+    
+    def __init__(self, scope, rate, store=None):
+        self.scope = scope
+        num, period = rate.split('/')
+        self.limit, self.window = int(num), PERIODS[period[0]]
+        self.store = store or get_store()
+    
+    def hit(self, ident):
+        """
+        Register an attempt, returns seconds to wait or None if allowed.
+        Регистрация попытки, возвращает время ожидания в секундах или None.
+        """
+        now = time.time()
+        index, elapsed = divmod(now, self.window)
+        key = f'ratelimit:{self.scope}:{ident}:{int(index)}'
+        previous = self.store.get(f'ratelimit:{self.scope}:{ident}:{int(index) - 1}')
+        current = self.store.incr(key, self.window * 2)
+        estimate = previous * (1 - elapsed / self.window) + current
+        if estimate > self.limit:
+            return self.window - elapsed
+        return None
+
+
+def check_login_attempt(ip, email=None):
+    """
+    Count a login/registration attempt by IP and email.
+    Returns seconds to wait or None if the attempt is allowed.
+    Учет попытки входа/регистрации по IP и email.
+    Возвращает время ожидания в секундах или None, если попытка разрешена.
+    """
+    waits = []
+    ip_rate = getattr(settings, 'LOGIN_RATE_LIMIT_IP', None)
+    if ip_rate and ip:
+        waits.append(SlidingWindowLimiter('login-ip', ip_rate).hit(ip))
+    email_rate = getattr(settings, 'LOGIN_RATE_LIMIT_EMAIL', None)
+    if email_rate and email:
+        waits.append(SlidingWindowLimiter('login-email', email_rate).hit(email.strip().lower()))
+    waits = [wait for wait in waits if wait is not None]
+    return max(waits) if waits else None
+
+
+class LoginRateThrottle(BaseThrottle):
+    """
+    DRF throttle for login and register, runs before the view body.
+    Throttle-класс DRF для входа и регистрации, выполняется до тела представления.
+    """
+    
+    def allow_request(self, request, view):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        self._wait = check_login_attempt(self.get_ident(request), email if isinstance(email, str) else None)
+        return self._wait is None
+    
+    def wait(self):
+        return self._wait
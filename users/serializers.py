@@ -4,8 +4,8 @@ Serializers for users app.
 """
 from rest_framework import serializers
 from django.contrib.auth import authenticate
-from rest_framework.authtoken.models import Token
-from .models import User
+from .models import User, SessionToken
+from .tokens import InvalidToken, verify_refresh_token
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -42,17 +42,23 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             full_name=validated_data['full_name'],
             password=validated_data['password']
         )
-        Token.objects.create(user=user)
         return user
 
 
-class UserLoginSerializer(serializers.Serializer):
+class UserCredentialsSerializer(serializers.Serializer):
     """
-    Serializer for user login.
-    Сериализатор для входа пользователя.
+    Serializer for login credentials without authentication.
+    Сериализатор учетных данных для входа без аутентификации.
     """
     email = serializers.EmailField()
     password = serializers.CharField(write_only=True)
+
+
+class UserLoginSerializer(UserCredentialsSerializer):
+    """
+    Serializer for user login.
+    Сериализатор для входа пользователя.
+    """
     
     def validate(self, attrs):
         """
@@ -76,6 +82,33 @@ class UserLoginSerializer(serializers.Serializer):
         return attrs
 
 
+class TokenRefreshSerializer(serializers.Serializer):
+    """
+    Serializer for refreshing signed tokens.
+    Сериализатор для обновления подписанных токенов.
+    """
+    refresh_token = serializers.CharField()
+    
+    def validate(self, attrs):
+        """
+        Validate refresh token and its generation; rotation happens in the view.
+        Проверка токена обновления и его поколения; ротация выполняется в представлении.
+        """
+        try:
+            payload = verify_refresh_token(attrs['refresh_token'])
+        except InvalidToken as e:
+            raise serializers.ValidationError({'refresh_token': str(e)})
+        
+        user = User.objects.filter(pk=payload['uid'], is_active=True).first()
+        if not user or user.token_generation != payload['gen']:
+            raise serializers.ValidationError({
+                'refresh_token': 'Token has been revoked. / Токен отозван.'
+            })
+        attrs['user'] = user
+        attrs['payload'] = payload
+        return attrs
+
+
 class UserProfileSerializer(serializers.ModelSerializer):
     """
     Serializer for user profile.
@@ -97,3 +130,18 @@ class UserUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('full_name',)
+
+
+class SessionTokenSerializer(serializers.ModelSerializer):
+    """
+    Serializer for sessions of the current user.
+    Сериализатор для сессий текущего пользователя.
+    """
+    current = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = SessionToken
+        fields = ('id', 'device', 'ip_address', 'created_at', 'expires_at', 'current')
+    
+    def get_current(self, obj):
+        return obj.pk == self.context.get('current_id')
@@ -0,0 +1,162 @@
+"""
+Multi-session opaque tokens.
+Непрозрачные токены для нескольких сессий.
+
+Every login issues a new SessionToken, so each device has its own token and
+logout ends only that session. The database stores the SHA-256 of the key,
+the key itself is returned to the client once. Revocation of all sessions of
+a user is one UPDATE of User.token_generation (see tokens.revoke_tokens):
+sessions issued under an older generation are rejected by an in-memory
+comparison against the cached user.
+Каждый вход выпускает новый SessionToken, поэтому у каждого устройства свой
+токен, а logout завершает только эту сессию. В БД хранится SHA-256 ключа,
+сам ключ возвращается клиенту один раз. Отзыв всех сессий пользователя — один
+UPDATE User.token_generation (см. tokens.revoke_tokens): сессии, выпущенные
+со старым поколением, отклоняются сравнением в памяти с закэшированным
+пользователем.
+"""
+import hashlib
+import secrets
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+from .cache import invalidate_token
+from .models import SessionToken
+
+
+def generate_key():
+    """
+    New random token key (40 hex characters, as DRF tokens).
+    Новый случайный ключ токена (40 hex-символов, как у токенов DRF).
+    """
+    return secrets.token_hex(20)
+
+
+def hash_key(key):
+    """
+    Stored and cached form of a token key.
+    Хранимая и кэшируемая форма ключа токена.
+    """
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def get_session_lifetime():
+    """
+    Session token lifetime in seconds, 0 means no expiry.
+    Время жизни токена сессии в секундах, 0 — без истечения.
+    """
+    return getattr(settings, 'SESSION_TOKEN_LIFETIME', 2592000)
+
+
+def session_metadata(request, data):
+    """
+    Device (from the "device" field or User-Agent) and IP of a login request.
+    Устройство (из поля "device" или User-Agent) и IP запроса входа.
+    """
+    device = data.get('device') if isinstance(data.get('device'), str) else None
+    return {
+        'device': (device or request.META.get('HTTP_USER_AGENT', ''))[:255],
+        'ip_address': request.META.get('REMOTE_ADDR') or None,
+    }
+
+
+def new_session(user, device='', ip_address=None):
+    """
+    Build an unsaved session token, returns (session, key).
+    Создание несохраненного токена сессии, возвращает (сессия, ключ).
+    """
+    key = generate_key()
+    lifetime = get_session_lifetime()
+    session = SessionToken(
+        key_hash=hash_key(key),
+        user=user,
+        generation=user.token_generation,
+        device=device,
+        ip_address=ip_address,
+        expires_at=timezone.now() + timedelta(seconds=lifetime) if lifetime else None,
+    )
+    return session, key
+
+
+def issue_session(user, request, data):
+    """
+    Create a session token for a login request, returns (session, key).
+    Создание токена сессии для запроса входа, возвращает (сессия, ключ).
+    """
+    session, key = new_session(user, **session_metadata(request, data))
+    session.save()
+    return session, key
+
+
+async def aissue_session(user, request, data):
+    """
+    Async variant of issue_session.
+    Асинхронный вариант issue_session.
+    """
+    session, key = new_session(user, **session_metadata(request, data))
+    await session.asave()
+    return session, key
+
+
+def session_response(session, key):
+    """
+    Token fields of login/register responses.
+    Поля токена в ответах входа/регистрации.
+    """
+    return {
+        'token': key,
+        'expires_at': session.expires_at.isoformat() if session.expires_at else None,
+    }
+
+
+def revoke_session(session):
+    """
+    End one session: delete its row and drop its cached resolution.
+    Завершение одной сессии: удаление строки и сброс закэшированного разрешения.
+    """
+    SessionToken.objects.filter(key_hash=session.key_hash).delete()
+    invalidate_token(session.key_hash)
+
+
+def stale_sessions_queryset(now=None):
+    """
+    Sessions that can never authenticate again: expired or of an old generation.
+    Сессии, которые больше не смогут аутентифицироваться: истекшие или старого поколения.
+    """
+    now = now or timezone.now()
+    return SessionToken.objects.filter(
+        Q(expires_at__lte=now) | Q(generation__lt=F('user__token_generation'))
+    )
+
+
+def sweep_sessions(batch_size=None, pause=None, max_batches=None):
+    """
+    Delete stale sessions in batches walking the primary key: each batch
+    selects up to batch_size ids after the previous one and deletes them in
+    its own short transaction, then sleeps pause seconds. Yields
+    (rows deleted, seconds spent in SQL) per batch.
+    Удаление устаревших сессий пакетами с обходом по первичному ключу: каждый
+    пакет выбирает до batch_size id после предыдущего и удаляет их в своей
+    короткой транзакции, затем ждет pause секунд. Возвращает
+    (удалено строк, секунд в SQL) для каждого пакета.
+    """
+    batch_size = batch_size or getattr(settings, 'SESSION_SWEEP_BATCH_SIZE', 1000)
+    pause = getattr(settings, 'SESSION_SWEEP_PAUSE', 0.1) if pause is None else pause
+    now = timezone.now()
+    last_pk, batches = 0, 0
+    while max_batches is None or batches < max_batches:
+        started = time.perf_counter()
+        ids = list(
+            stale_sessions_queryset(now).filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            return
+        deleted, _ = SessionToken.objects.filter(pk__in=ids).delete()
+        last_pk, batches = ids[-1], batches + 1
+        yield deleted, time.perf_counter() - started
+        if len(ids) < batch_size:
+            return
+        if pause:
+            time.sleep(pause)
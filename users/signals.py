@@ -0,0 +1,20 @@
+"""
+Signal handlers for users app.
+Обработчики сигналов для приложения users.
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from .cache import invalidate_user_tokens
+from .models import User
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_user(sender, instance, created=False, raw=False, **kwargs):
+    """
+    Drop cached token resolution when user changes (e.g. is_active).
+    Сброс закэшированного разрешения токенов при изменении пользователя
+    (например, is_active).
+    """
+    if created or raw:
+        return
+    invalidate_user_tokens(instance)
@@ -0,0 +1,154 @@
+"""
+Stateless signed access tokens.
+Stateless подписанные токены доступа.
+
+Access tokens are HMAC-signed with SECRET_KEY and embed user id and token
+generation, so they are verified without the session token table; permissions
+are always resolved from the current cached permission set. Bumping
+User.token_generation revokes all issued tokens.
+Токены доступа подписываются HMAC на основе SECRET_KEY и содержат id
+пользователя и поколение токенов, поэтому проверяются без таблицы токенов
+сессий; права всегда берутся из текущего закэшированного набора прав.
+Увеличение User.token_generation отзывает все токены.
+
+Refresh tokens are bound to the login session and rotate: each refresh
+advances SessionToken.refresh_counter with a conditional UPDATE, so a refresh
+token works once. Presenting an already used one means it leaked; the whole
+session (its chain of refresh tokens and its opaque token) is revoked.
+Токены обновления привязаны к сессии входа и ротируются: каждое обновление
+увеличивает SessionToken.refresh_counter условным UPDATE, поэтому токен
+обновления срабатывает один раз. Повторное предъявление использованного
+токена означает утечку; вся сессия (цепочка токенов обновления и ее
+непрозрачный токен) отзывается.
+"""
+import time
+from django.conf import settings
+from django.core import signing
+from django.db.models import F
+from django.utils import timezone
+from .cache import invalidate_user_tokens
+from .models import SessionToken
+from .sessions import revoke_session
+
+ACCESS_SALT = 'users.tokens.access'
+REFRESH_SALT = 'users.tokens.refresh'
+
+
+class InvalidToken(Exception):
+    """
+    Raised when a signed token is malformed, tampered with or expired.
+    Исключение для поврежденного, подделанного или истекшего токена.
+    """
+
+
+def stateless_tokens_enabled():
+    """
+    Check if stateless token mode is enabled.
+    Проверка, включен ли режим stateless токенов.
+    """
+    return getattr(settings, 'STATELESS_TOKENS', False)
+
+
+def make_access_token(user):
+    """
+    Issue a short-lived signed access token.
+    Выпуск короткоживущего подписанного токена доступа.
+    """
+    return signing.dumps({'uid': user.pk, 'gen': user.token_generation}, salt=ACCESS_SALT)
+
+
+def make_refresh_token(user, session):
+    """
+    Issue a signed refresh token for the current step of the session's chain.
+    The token never outlives its session: "exp" carries the session expiry.
+    Выпуск подписанного токена обновления для текущего шага цепочки сессии.
+    Токен не переживает свою сессию: "exp" содержит срок действия сессии.
+    """
+    payload = {
+        'uid': user.pk,
+        'gen': user.token_generation,
+        'sid': session.pk,
+        'rc': session.refresh_counter,
+    }
+    if session.expires_at is not None:
+        payload['exp'] = int(session.expires_at.timestamp())
+    return signing.dumps(payload, salt=REFRESH_SALT)
+
+
+def issue_tokens(user, session):
+    """
+    Issue access and refresh tokens for the user's login session.
+    Выпуск токенов доступа и обновления для сессии входа пользователя.
+    """
+    return {
+        'access_token': make_access_token(user),
+        'refresh_token': make_refresh_token(user, session),
+    }
+
+
+def rotate_tokens(user, payload):
+    """
+    Spend a verified refresh token and issue the next pair. An expired
+    session or one of an older generation cannot be refreshed, as in
+    CachedTokenAuthentication.check_session; a token that was already spent
+    revokes its session.
+    Использование проверенного токена обновления и выпуск следующей пары.
+    Истекшую сессию или сессию старого поколения нельзя обновить, как в
+    CachedTokenAuthentication.check_session; уже использованный токен отзывает
+    свою сессию.
+    """
+    session = SessionToken.objects.filter(pk=payload.get('sid'), user=user).first()
+    if session is None or session.generation != user.token_generation:
+        raise InvalidToken('Token has been revoked. / Токен отозван.')
+    if session.expires_at is not None and session.expires_at <= timezone.now():
+        raise InvalidToken('Token has expired. / Срок действия токена истек.')
+    spent = SessionToken.objects.filter(pk=session.pk, refresh_counter=payload.get('rc')).update(
+        refresh_counter=F('refresh_counter') + 1
+    )
+    if not spent:
+        revoke_session(session)
+        raise InvalidToken('Token has been revoked. / Токен отозван.')
+    session.refresh_counter = payload['rc'] + 1
+    return issue_tokens(user, session)
+
+
+def _load(token, salt, max_age):
+    try:
+        return signing.loads(token, salt=salt, max_age=max_age)
+    except signing.SignatureExpired:
+        raise InvalidToken('Token has expired. / Срок действия токена истек.')
+    except signing.BadSignature:
+        raise InvalidToken('Invalid token. / Недействительный токен.')
+
+
+def verify_access_token(token):
+    """
+    Verify signature and expiry of an access token and return its payload.
+    Проверка подписи и срока действия токена доступа, возвращает его данные.
+    """
+    return _load(token, ACCESS_SALT, getattr(settings, 'ACCESS_TOKEN_LIFETIME', 300))
+
+
+def verify_refresh_token(token):
+    """
+    Verify signature and expiry of a refresh token (its own lifetime and the
+    session expiry in "exp") and return its payload.
+    Проверка подписи и срока действия токена обновления (собственного и срока
+    сессии в "exp"), возвращает его данные.
+    """
+    payload = _load(token, REFRESH_SALT, getattr(settings, 'REFRESH_TOKEN_LIFETIME', 86400))
+    if payload.get('exp') is not None and payload['exp'] <= time.time():
+        raise InvalidToken('Token has expired. / Срок действия токена истек.')
+    return payload
+
+
+def revoke_tokens(user):
+    """
+    Revoke all signed and session tokens of the user by bumping the token
+    generation: one UPDATE, the tokens table is not touched.
+    Отзыв всех подписанных токенов и токенов сессий пользователя увеличением
+    поколения токенов: один UPDATE, таблица токенов не затрагивается.
+    """
+    type(user).objects.filter(pk=user.pk).update(token_generation=F('token_generation') + 1)
+    user.refresh_from_db(fields=['token_generation'])
+    invalidate_user_tokens(user)
@@ -3,7 +3,7 @@ URLs for users app.
 URL-маршруты для приложения users.
 """
 from django.urls import path
-from . import views
+from . import views, async_views
 
 app_name = 'users'
 
@@ -11,7 +11,15 @@ urlpatterns = [
     path('register/', views.register, name='register'),
     path('login/', views.login, name='login'),
     path('logout/', views.logout_view, name='logout'),
+    path('logout/all/', views.logout_all, name='logout-all'),
+    path('sessions/', views.session_list, name='session-list'),
+    path('sessions/<int:pk>/', views.session_detail, name='session-detail'),
+    path('token/refresh/', views.refresh_token, name='token-refresh'),
     path('profile/', views.UserProfileView.as_view(), name='profile'),
+    path('profile/permissions/', views.profile_permissions, name='profile-permissions'),
     path('profile/update/', views.UserUpdateView.as_view(), name='update-profile'),
     path('delete/', views.delete_user, name='delete-user'),
+    path('async/register/', async_views.register, name='async-register'),
+    path('async/login/', async_views.login, name='async-login'),
+    path('async/profile/', async_views.profile, name='async-profile'),
 ]
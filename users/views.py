@@ -3,22 +3,30 @@ Views for users app.
 Представления для приложения users.
 """
 from rest_framework import status, generics
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.authtoken.models import Token
 from django.contrib.auth import logout
-from .models import User
+from django.utils import timezone
+from access.views import effective_permissions_response
+from core.metrics import LOGIN_ATTEMPTS
+from .models import User, SessionToken
+from .ratelimit import LoginRateThrottle
 from .serializers import (
     UserRegistrationSerializer,
     UserLoginSerializer,
     UserProfileSerializer,
-    UserUpdateSerializer
+    UserUpdateSerializer,
+    TokenRefreshSerializer,
+    SessionTokenSerializer
 )
+from .sessions import issue_session, revoke_session, session_response
+from .tokens import InvalidToken, issue_tokens, revoke_tokens, rotate_tokens, stateless_tokens_enabled
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([LoginRateThrottle])
 def register(request):
     """
     User registration endpoint.
@@ -27,17 +35,21 @@ def register(request):
     serializer = UserRegistrationSerializer(data=request.data)
     if serializer.is_valid():
         user = serializer.save()
-        token, created = Token.objects.get_or_create(user=user)
-        return Response({
+        session, key = issue_session(user, request, request.data)
+        data = {
             'message': 'User registered successfully. / Пользователь успешно зарегистрирован.',
-            'token': token.key,
+            **session_response(session, key),
             'user': UserProfileSerializer(user).data
-        }, status=status.HTTP_201_CREATED)
+        }
+        if stateless_tokens_enabled():
+            data.update(issue_tokens(user, session))
+        return Response(data, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([LoginRateThrottle])
 def login(request):
     """
     User login endpoint.
@@ -45,13 +57,18 @@ def login(request):
     """
     serializer = UserLoginSerializer(data=request.data, context={'request': request})
     if serializer.is_valid():
+        LOGIN_ATTEMPTS.inc(result='success')
         user = serializer.validated_data['user']
-        token, created = Token.objects.get_or_create(user=user)
-        return Response({
+        session, key = issue_session(user, request, request.data)
+        data = {
             'message': 'Login successful. / Вход выполнен успешно.',
-            'token': token.key,
+            **session_response(session, key),
             'user': UserProfileSerializer(user).data
-        }, status=status.HTTP_200_OK)
+        }
+        if stateless_tokens_enabled():
+            data.update(issue_tokens(user, session))
+        return Response(data, status=status.HTTP_200_OK)
+    LOGIN_ATTEMPTS.inc(result='failure')
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
@@ -59,17 +76,86 @@ def login(request):
 @permission_classes([IsAuthenticated])
 def logout_view(request):
     """
-    User logout endpoint.
-    Endpoint для выхода пользователя.
+    User logout endpoint. Ends the current session only; signed tokens
+    cannot be revoked one by one, so Bearer logout revokes all of them.
+    Endpoint для выхода пользователя. Завершает только текущую сессию;
+    подписанные токены нельзя отозвать по одному, поэтому выход по Bearer
+    отзывает их все.
     """
-    try:
-        request.user.auth_token.delete()
-    except Exception:
-        pass
+    if isinstance(request.auth, SessionToken):
+        revoke_session(request.auth)
+    elif stateless_tokens_enabled():
+        revoke_tokens(request.user)
     logout(request)
     return Response({'message': 'Logout successful. / Выход выполнен успешно.'}, status=status.HTTP_200_OK)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def logout_all(request):
+    """
+    End all sessions and revoke all signed tokens of the user with one write.
+    Завершение всех сессий и отзыв всех подписанных токенов пользователя одной записью.
+    """
+    revoke_tokens(request.user)
+    logout(request)
+    return Response({
+        'message': 'Logged out on all devices. / Выход выполнен на всех устройствах.'
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def session_list(request):
+    """
+    Active sessions of the current user.
+    Активные сессии текущего пользователя.
+    """
+    sessions = SessionToken.objects.filter(
+        user=request.user, generation=request.user.token_generation
+    ).exclude(expires_at__lte=timezone.now())
+    current_id = request.auth.pk if isinstance(request.auth, SessionToken) else None
+    return Response(SessionTokenSerializer(sessions, many=True, context={'current_id': current_id}).data)
+
+
+@api_view(['DELETE'])
+@permission_classes([IsAuthenticated])
+def session_detail(request, pk):
+    """
+    End one session of the current user (e.g. a lost device).
+    Завершение одной сессии текущего пользователя (например, потерянного устройства).
+    """
+    session = SessionToken.objects.filter(user=request.user, pk=pk).first()
+    if session is None:
+        return Response({'detail': 'Session not found. / Сессия не найдена.'}, status=status.HTTP_404_NOT_FOUND)
+    revoke_session(session)
+    return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def refresh_token(request):
+    """
+    Issue new signed tokens by a refresh token. The refresh token is spent,
+    the response carries the next one; reusing a spent token revokes its session.
+    Выпуск новых подписанных токенов по токену обновления. Токен обновления
+    расходуется, ответ содержит следующий; повторное использование
+    израсходованного токена отзывает его сессию.
+    """
+    if not stateless_tokens_enabled():
+        return Response({
+            'detail': 'Stateless tokens are disabled. / Stateless токены отключены.'
+        }, status=status.HTTP_404_NOT_FOUND)
+    serializer = TokenRefreshSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        tokens = rotate_tokens(serializer.validated_data['user'], serializer.validated_data['payload'])
+    except InvalidToken as e:
+        return Response({'refresh_token': [str(e)]}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(tokens, status=status.HTTP_200_OK)
+
+
 class UserProfileView(generics.RetrieveAPIView):
     """
     Get user profile.
@@ -82,6 +168,16 @@ class UserProfileView(generics.RetrieveAPIView):
         return self.request.user
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def profile_permissions(request):
+    """
+    Get effective permissions of the current user.
+    Получение действующих прав текущего пользователя.
+    """
+    return effective_permissions_response(request, request.user)
+
+
 class UserUpdateView(generics.UpdateAPIView):
     """
     Update user profile.
@@ -109,10 +205,7 @@ def delete_user(request):
     Мягкое удаление учетной записи пользователя.
     """
     user = request.user
-    try:
-        user.auth_token.delete()
-    except Exception:
-        pass
+    revoke_tokens(user)
     logout(request)
     user.is_active = False
     user.save()